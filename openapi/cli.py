@@ -8,8 +8,10 @@ import click
 from aiohttp import web
 from aiohttp.web import Application
 
+from . import json
 from .logger import logger, setup_logging
 from .spec import OpenApiSpec
+from .spec.utils import dump_yaml
 from .utils import get_debug_flag
 
 HOST = os.environ.get("MICRO_SERVICE_HOST", "0.0.0.0")
@@ -61,6 +63,7 @@ class OpenApiClient(click.Group):
         extra.setdefault("callback", setup_logging)
         super().__init__(params=params, **extra)
         self.add_command(serve)
+        self.add_command(spec_commands)
         for command in commands or ():
             self.add_command(command)
 
@@ -151,3 +154,42 @@ def serve(ctx, host, port, index, reload):
         loop=cli.loop,
         print=access_log.info if access_log else None,
     )
+
+
+@click.group("spec")
+def spec_commands():
+    """OpenAPI specification utilities"""
+    pass
+
+
+@spec_commands.command("export")
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="File where to write the spec (default to standard output)",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["json", "yaml"]),
+    help="Output format, if not given it is inferred from the output file extension",
+)
+@click.pass_context
+def export(ctx, output, fmt):
+    """Build the OpenAPI spec and write it to a file."""
+    cli = open_api_cli(ctx)
+    if not cli.spec:
+        raise click.ClickException("OpenAPI spec not available")
+    # build the spec of the application as it is served, so that
+    # paths are relative to the base path
+    cli.get_serve_app()
+    doc = cli.spec.build_app(cli.web(server=True))
+    if not fmt:
+        fmt = "yaml" if output.name.endswith((".yaml", ".yml")) else "json"
+    if fmt == "yaml":
+        output.write(dump_yaml(json.loads(json.dumps(doc))))
+    else:
+        output.write(json.dumps(doc, indent=2))
+        output.write("\n")
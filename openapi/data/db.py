@@ -76,6 +76,28 @@ def column_info(columns: Set[str], value: Union[bool, Sequence[str]]) -> Set[str
         return set(value if value is not None else columns)
 
 
+def unique_keys(table: sa.Table) -> List[Tuple[str, ...]]:
+    """Column names of the primary key, unique constraints and
+    (non partial) unique indexes of a table, in this order
+    """
+    candidates = [table.primary_key.columns]
+    candidates.extend(
+        constraint.columns
+        for constraint in table.constraints
+        if isinstance(constraint, sa.UniqueConstraint)
+    )
+    candidates.extend(
+        index.columns
+        for index in table.indexes
+        if index.unique and not index.dialect_options["postgresql"].get("where")
+    )
+    return [
+        tuple(column.name for column in candidate)
+        for candidate in candidates
+        if len(candidate)
+    ]
+
+
 def converter(*types):
     def _(f):
         for type_ in types:
@@ -1,11 +1,15 @@
 from dataclasses import asdict, fields
-from typing import Any, Dict, List, Optional, Union, cast
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 from openapi.types import Record
 
 from ..utils import TypingInfo, iter_items
 from .fields import DUMP
 
+DumpFunction = Callable[[Any], Any]
+RowPlan = Tuple[Tuple[int, str, Optional[DumpFunction]], ...]
+
 
 def is_nothing(value: Any) -> bool:
     if value == 0 or value is False:
@@ -20,15 +24,8 @@ def dump(schema: Any, data: Any) -> Any:
     :param data: data to dump, if dataclasses are part of the schema,
         the `dump` metadata function will be used if available (see :func:`.data_field`)
     """
-    type_info = cast(TypingInfo, TypingInfo.get(schema))
-    if type_info.container is list:
-        return dump_list(type_info.element, cast(List, data))
-    elif type_info.container is dict:
-        return dump_dict(type_info.element, cast(Dict, data))
-    elif type_info.is_dataclass:
-        return dump_dataclass(type_info.element, data)
-    else:
-        return data
+    dumper = type_dumper(cast(TypingInfo, TypingInfo.get(schema)))
+    return dumper(data) if dumper else data
 
 
 def dump_dataclass(schema: Any, data: Optional[Union[Dict, Record]] = None) -> Dict:
@@ -38,19 +35,39 @@ def dump_dataclass(schema: Any, data: Optional[Union[Dict, Record]] = None) -> D
     """
     if data is None:
         data = asdict(schema)
+        schema = type(schema)
     elif isinstance(data, schema):
         data = asdict(data)
+    elif isinstance(data, Record):
+        return dump_row(row_dump_plan(schema, data._fields), data)
+    plan = dump_plan(schema)
     cleaned = {}
-    fields_ = {f.name: f for f in fields(schema)}
     for name, value in iter_items(data):
-        if name not in fields_ or is_nothing(value):
+        if name not in plan or is_nothing(value):
             continue
-        field = fields_[name]
-        dump_value = field.metadata.get(DUMP)
-        if dump_value:
-            value = dump_value(value)
-        cleaned[field.name] = dump(field.type, value)
+        dumper = plan[name]
+        cleaned[name] = dumper(value) if dumper else value
+    return cleaned
+
 
+def dump_rows(schema: type, rows: Sequence[Record]) -> List[Dict]:
+    """Dump a sequence of database rows with a given dataclass.
+
+    Column values are read by position, the mapping between columns and
+    dataclass fields is resolved once for all rows.
+    """
+    if not rows:
+        return []
+    plan = row_dump_plan(schema, rows[0]._fields)
+    return [dump_row(plan, row) for row in rows]
+
+
+def dump_row(plan: RowPlan, row: Sequence) -> Dict:
+    cleaned = {}
+    for index, name, dumper in plan:
+        value = row[index]
+        if not is_nothing(value):
+            cleaned[name] = dumper(value) if dumper else value
     return cleaned
 
 
@@ -62,3 +79,61 @@ def dump_list(schema: Any, data: List) -> List[Dict]:
 def dump_dict(schema: Any, data: Dict[str, Any]) -> List[Dict]:
     """Validate a dictionary of data with a given dataclass"""
     return {name: dump(schema, d) for name, d in data.items()}
+
+
+@lru_cache(None)
+def dump_plan(schema: type) -> Dict[str, Optional[DumpFunction]]:
+    """Compile a dataclass schema into a mapping of field names to dump functions.
+
+    The dump function is `None` for fields whose values are passed through
+    unchanged. The plan is built once per schema and cached.
+    """
+    plan: Dict[str, Optional[DumpFunction]] = {}
+    for field in fields(schema):
+        dump_value = field.metadata.get(DUMP)
+        nested = type_dumper(cast(TypingInfo, TypingInfo.get(field.type)))
+        if dump_value and nested:
+            plan[field.name] = chain_dumpers(dump_value, nested)
+        else:
+            plan[field.name] = dump_value or nested
+    return plan
+
+
+@lru_cache(None)
+def row_dump_plan(schema: type, keys: Tuple[str, ...]) -> RowPlan:
+    """Compile the mapping between row columns and dataclass fields
+
+    :param schema: dataclass schema
+    :param keys: column names of the rows, in order
+    """
+    plan = dump_plan(schema)
+    return tuple(
+        (index, key, plan[key]) for index, key in enumerate(keys) if key in plan
+    )
+
+
+@lru_cache(None)
+def type_dumper(type_info: TypingInfo) -> Optional[DumpFunction]:
+    """Compile a :class:`.TypingInfo` into a dump function.
+
+    It returns `None` when data of this type does not require dumping.
+    Nested dataclasses are resolved lazily so that recursive schemas are supported.
+    """
+    if type_info.container is list:
+        element = type_dumper(cast(TypingInfo, TypingInfo.get(type_info.element)))
+        if element is None:
+            return list
+        return lambda data: [element(d) for d in data]
+    elif type_info.container is dict:
+        element = type_dumper(cast(TypingInfo, TypingInfo.get(type_info.element)))
+        if element is None:
+            return dict
+        return lambda data: {name: element(d) for name, d in data.items()}
+    elif type_info.is_dataclass:
+        return partial(dump_dataclass, type_info.element)
+    else:
+        return None
+
+
+def chain_dumpers(first: DumpFunction, second: DumpFunction) -> DumpFunction:
+    return lambda value: second(first(value))
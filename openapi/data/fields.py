@@ -6,7 +6,6 @@ from numbers import Number
 from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 from uuid import UUID
 
-from dateutil.parser import parse as parse_date
 from email_validator import EmailNotValidError, validate_email
 
 from .. import json, tz
@@ -21,6 +20,7 @@ FORMAT = "format"
 OPS = "ops"
 ITEMS = "items"
 HIDDEN = "hidden"
+DISCRIMINATOR = "discriminator"
 
 
 PRIMITIVE_TYPES: Dict[Any, Dict] = {
@@ -65,6 +65,7 @@ def data_field(
     ops: Tuple = (),
     hidden: bool = False,
     meta: Optional[Dict[str, Any]] = None,
+    discriminator: Optional[str] = None,
     **kwargs,
 ) -> Field:
     """Extend a dataclass field with the following metadata
@@ -82,6 +83,8 @@ def data_field(
     :param ops: optional tuple of strings specifying available operations
     :param hidden: when `True` the field is not added to the Openapi documentation
     :param meta: optional dictionary with additional metadata
+    :param discriminator: name of the tag field which selects the member of
+        a union of dataclasses (only used for `Union` fields)
     """
     if isinstance(validator, Validator) and not dump:
         dump = validator.dump
@@ -102,6 +105,7 @@ def data_field(
                 FORMAT: format,
                 OPS: ops,
                 HIDDEN: hidden,
+                DISCRIMINATOR: discriminator,
                 **meta,
             }
         ),
@@ -216,9 +220,13 @@ def as_field(item: Any, *, field: Optional[Field] = None, **kw) -> Field:
     return field
 
 
-def json_field(**kw) -> Field:
-    """A specialized :func:`.data_field` for JSON data"""
-    kw.setdefault("validator", JSONValidator())
+def json_field(max_depth: int = 0, max_size: int = 0, **kw) -> Field:
+    """A specialized :func:`.data_field` for JSON data
+
+    :param max_depth: optional maximum nesting depth of the JSON document
+    :param max_size: optional maximum number of values in the JSON document
+    """
+    kw.setdefault("validator", JSONValidator(max_depth=max_depth, max_size=max_size))
     return data_field(**kw)
 
 
@@ -329,7 +337,7 @@ class EnumValidator(Validator):
                 return e if field.type == self.EnumClass else e.name
             raise AttributeError
         except AttributeError:
-            raise ValidationError(field.name, "%s not valid" % value)
+            raise ValidationError(field.name, "%s not valid" % (value,))
 
     def dump(self, value: Any) -> Any:
         if isinstance(value, self.EnumClass):
@@ -343,7 +351,7 @@ class Choice(Validator):
 
     def __call__(self, field: Field, value: Any) -> Any:
         if value not in self.choices:
-            raise ValidationError(field.name, "%s not valid" % value)
+            raise ValidationError(field.name, "%s not valid" % (value,))
         return value
 
     def openapi(self, prop: Dict) -> None:
@@ -351,6 +359,9 @@ class Choice(Validator):
 
 
 class DateValidator(Validator):
+    def __init__(self, loose: Optional[bool] = None) -> None:
+        self.loose = loose
+
     def dump(self, value: Any) -> Any:
         if isinstance(value, datetime):
             return value.date().isoformat()
@@ -361,7 +372,7 @@ class DateValidator(Validator):
     def __call__(self, field: Field, value: Any) -> Any:
         if isinstance(value, str):
             try:
-                value = parse_date(value).date()
+                value = tz.parse_date(value, loose=self.loose)
             except ValueError:
                 pass
         if not isinstance(value, date):
@@ -370,8 +381,9 @@ class DateValidator(Validator):
 
 
 class DateTimeValidator(Validator):
-    def __init__(self, timezone=False) -> None:
+    def __init__(self, timezone=False, loose: Optional[bool] = None) -> None:
         self.timezone = timezone
+        self.loose = loose
 
     def dump(self, value: Any) -> Any:
         if isinstance(value, datetime):
@@ -381,7 +393,7 @@ class DateTimeValidator(Validator):
     def __call__(self, field: Field, value: Any) -> Any:
         if isinstance(value, str):
             try:
-                value = parse_date(value)
+                value = tz.parse_datetime(value, loose=self.loose)
             except ValueError:
                 pass
         if not isinstance(value, datetime):
@@ -395,6 +407,9 @@ class DateTimeValidator(Validator):
 
 
 NumericErrors = (TypeError, ValueError, InvalidOperation)
+JSON_KEYS = (str, int, float, bool, type(None))
+JSON_SCALARS = (str, int, float, Decimal, type(None), UUID, datetime, enum.Enum)
+JSON_ARRAYS = (list, tuple, set, frozenset)
 
 
 class BoundedNumberValidator(Validator):
@@ -491,11 +506,28 @@ class BoolValidator(Validator):
 
 
 class JSONValidator(Validator):
+    """Validate JSON data
+
+    Strings are decoded as JSON documents, other values are checked in a single
+    pass to be serializable and are returned as they are.
+
+    :param max_depth: optional maximum nesting depth of arrays and objects
+    :param max_size: optional maximum number of values in the document
+    """
+
+    def __init__(self, max_depth: int = 0, max_size: int = 0) -> None:
+        self.max_depth = max_depth
+        self.max_size = max_size
+
     def __call__(self, field: Field, value: Any) -> Any:
+        value = self.dump(value)
         try:
-            return self.dump(value)
-        except (json.JSONDecodeError, TypeError):
-            raise ValidationError(field.name, "%s not valid" % value)
+            self.check(value)
+        except TypeError:
+            raise ValidationError(field.name, "%s not valid" % (value,))
+        except ValueError as exc:
+            raise ValidationError(field.name, str(exc))
+        return value
 
     def dump(self, value: Any) -> Any:
         if isinstance(value, str):
@@ -503,4 +535,33 @@ class JSONValidator(Validator):
                 value = json.loads(value)
             except json.JSONDecodeError:
                 pass
-        return json.loads(json.dumps(value))
+        return value
+
+    def check(self, value: Any) -> None:
+        """Check that a value can be serialized into JSON
+
+        :raise TypeError: when the value is not serializable
+        :raise ValueError: when the value exceeds the depth or size limits
+        """
+        stack = [(value, 0)]
+        size = 0
+        while stack:
+            value, depth = stack.pop()
+            size += 1
+            if self.max_size and size > self.max_size:
+                raise ValueError("JSON document too large")
+            if isinstance(value, JSON_SCALARS):
+                continue
+            if isinstance(value, dict):
+                for key in value:
+                    if not isinstance(key, JSON_KEYS):
+                        raise TypeError
+                values: Any = value.values()
+            elif isinstance(value, JSON_ARRAYS):
+                values = value
+            else:
+                raise TypeError
+            depth += 1
+            if self.max_depth and depth > self.max_depth:
+                raise ValueError("JSON document too deep")
+            stack.extend((v, depth) for v in values)
@@ -1,13 +1,28 @@
 from dataclasses import MISSING, Field, fields
-from typing import Any, Dict, NamedTuple, Optional, Tuple, Union, cast
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
-from multidict import MultiDict
+from multidict import MultiDict, MultiDictProxy
 
 from openapi import json
 from openapi.types import Record
 
+from ..exc import InvalidTypeException
 from ..utils import TypingInfo
 from .fields import (
+    DISCRIMINATOR,
     ITEMS,
     POST_PROCESS,
     REQUIRED,
@@ -43,6 +58,48 @@ class ValidationErrors(ValueError):
     __str__ = __repr__
 
 
+class FieldPlan(NamedTuple):
+    """Pre-resolved validation information for a dataclass field"""
+
+    name: str
+    ops: Tuple[str, ...]
+    required: bool
+    default: Callable[[], Any]
+    collect: Callable[..., Any]
+
+
+class DataclassPlan(NamedTuple):
+    """Pre-resolved validation plan for a dataclass schema"""
+
+    schema: type
+    fields: Tuple[FieldPlan, ...]
+    validate: Optional[Callable[[Dict, Dict], None]] = None
+
+
+@lru_cache(None)
+def validation_plan(schema: type) -> DataclassPlan:
+    """Compile a dataclass schema into a :class:`.DataclassPlan`.
+
+    The plan is built once per schema and cached, so that field metadata,
+    operation names and type annotations are not inspected on every validation.
+    """
+    return DataclassPlan(
+        schema=schema,
+        fields=tuple(field_plan(field) for field in fields(schema)),
+        validate=getattr(schema, "validate", None),
+    )
+
+
+def field_plan(field: Field) -> FieldPlan:
+    return FieldPlan(
+        name=field.name,
+        ops=tuple(field_ops(field)),
+        required=field.metadata.get(REQUIRED, True),
+        default=default_getter(field),
+        collect=value_collector(field),
+    )
+
+
 def validated_schema(
     schema: Any,
     data: Any,
@@ -77,6 +134,7 @@ def validate(
     raise_on_errors: bool = False,
     items: Optional[Field] = None,
     as_schema: bool = False,
+    lazy: bool = False,
 ) -> Any:
     """Validate data with a given schema
 
@@ -91,10 +149,23 @@ def validate(
     :param items: an optional Field for items in a composite type (`List` or `Dict`)
     :param as_schema: return the schema object rather than simple data type
         (dataclass rather than dict for example)
+    :param lazy: when `True` and the schema is a `List` or a `Dict`, a
+        :class:`.ValidatingList` or :class:`.ValidatingDict` view is returned and
+        elements are validated on access
     """
     type_info = cast(TypingInfo, TypingInfo.get(schema))
     try:
-        if type_info.container is list:
+        if lazy and type_info.container:
+            view = validating_view(
+                type_info,
+                data,
+                strict=strict,
+                multiple=multiple,
+                items=items,
+                as_schema=as_schema,
+            )
+            return view if raise_on_errors else ValidatedData(data=view, errors={})
+        elif type_info.container is list:
             vdata = validate_list(
                 type_info.element,
                 data,
@@ -121,7 +192,12 @@ def validate(
                 as_schema=as_schema,
             )
         elif type_info.is_union:
-            vdata = validate_union(type_info.element, data, as_schema=as_schema)
+            vdata = validate_union(
+                type_info.element,
+                data,
+                as_schema=as_schema,
+                discriminator=type_info.discriminator,
+            )
         elif type_info.element is Any:
             vdata = data
         else:
@@ -134,6 +210,50 @@ def validate(
         return vdata if raise_on_errors else ValidatedData(data=vdata, errors={})
 
 
+def validate_many(
+    schema: Any,
+    records: Any,
+    *,
+    strict: bool = True,
+    multiple: bool = False,
+    as_schema: bool = False,
+) -> ValidatedData:
+    """Validate a sequence of records with a given schema
+
+    The schema is resolved once for all records and, unlike :func:`.validate`,
+    validation does not stop at the first invalid record.
+
+    :param schema: a valid :ref:`aio-openapi-schema` or a :class:`.TypingInfo`
+        object for a single record
+    :param records: a sequence of data objects to validate against the schema
+    :param strict: if `True` validation is strict, i.e. missing required parameters
+        will cause validation to fails
+    :param multiple: allow parameters to have multiple values
+    :param as_schema: return the schema object rather than simple data type
+    :return: a :class:`.ValidatedData` where `data` is the list of validated
+        records (`None` for invalid records) and `errors` is a dictionary of
+        errors keyed by record index
+    """
+    if not isinstance(records, (list, tuple)):
+        return ValidatedData(errors="expected a sequence")
+    type_info = cast(TypingInfo, TypingInfo.get(schema))
+    if type_info.is_dataclass:
+        validator: Callable[..., Any] = partial(validate_dataclass, type_info.element)
+    else:
+        validator = partial(validate, type_info, raise_on_errors=True)
+    validated = ValidatedData(data=[], errors={})
+    for index, record in enumerate(records):
+        try:
+            value = validator(
+                record, strict=strict, multiple=multiple, as_schema=as_schema
+            )
+        except ValidationErrors as exc:
+            validated.errors[index] = exc.errors
+            value = None
+        validated.data.append(value)
+    return validated
+
+
 def validate_simple(schema: type, data: Any) -> Any:
     if isinstance(data, VALIDATION_SIMPLE_MAP.get(schema, schema)):
         return data
@@ -144,8 +264,18 @@ def validate_union(
     schema: Tuple[TypingInfo, ...],
     data: Any,
     as_schema: bool = False,
+    discriminator: Optional[str] = None,
     **kw,
 ) -> Any:
+    if discriminator:
+        mapping = discriminator_mapping(schema, discriminator)
+        if not isinstance(data, Mapping):
+            raise ValidationErrors(OBJECT_EXPECTED)
+        tag = data.get(discriminator)
+        member = mapping.get(tag)
+        if member is None:
+            raise ValidationErrors({discriminator: f"{tag} not a valid choice"})
+        return validate_dataclass(member.element, data, as_schema=as_schema)
     for type_info in schema:
         try:
             return validate(type_info, data, raise_on_errors=True, as_schema=as_schema)
@@ -154,6 +284,32 @@ def validate_union(
     raise ValidationErrors(NOT_VALID_TYPE)
 
 
+@lru_cache(None)
+def discriminator_mapping(
+    schema: Tuple[TypingInfo, ...], discriminator: str
+) -> Dict[Any, TypingInfo]:
+    """Map the tag values of a discriminated union to its dataclass members
+
+    The tag value of a member is the default value of its discriminator field.
+    """
+    mapping: Dict[Any, TypingInfo] = {}
+    for type_info in schema:
+        if type_info.is_none:
+            continue
+        field = (
+            type_info.element.__dataclass_fields__.get(discriminator)
+            if type_info.is_dataclass
+            else None
+        )
+        if field is None or field.default in (MISSING, None):
+            raise InvalidTypeException(
+                f"{type_info.element} must be a dataclass with a default "
+                f"value for discriminator {discriminator}"
+            )
+        mapping[field.default] = type_info
+    return mapping
+
+
 def validate_list(
     schema: type,
     data: list,
@@ -210,6 +366,96 @@ def validate_dict(
         raise ValidationErrors(OBJECT_EXPECTED)
 
 
+def validating_view(
+    type_info: TypingInfo,
+    data: Any,
+    *,
+    items: Optional[Field] = None,
+    **kw,
+) -> "ValidatingView":
+    if type_info.container is list:
+        if not isinstance(data, (list, tuple)):
+            raise ValidationErrors("expected a sequence")
+        return ValidatingList(as_field(type_info.element, field=items), data, **kw)
+    if not isinstance(data, dict):
+        raise ValidationErrors(OBJECT_EXPECTED)
+    return ValidatingDict(as_field(type_info.element, field=items), data, **kw)
+
+
+class ValidatingView:
+    """A view over a list or a dictionary which validates elements on access
+
+    Elements are validated every time they are accessed and are not stored.
+    Errors of invalid elements are collected in :attr:`errors` keyed by
+    their index or key.
+    """
+
+    def __init__(self, field: Field, data: Any, **kw) -> None:
+        self.field = field
+        self.data = data
+        self.errors: Dict = {}
+        self.kw = kw
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            value = collect_value(self.field, self.data[key], **self.kw)
+        except ValidationErrors as exc:
+            self.errors[key] = exc.errors
+            raise ValidationErrors({key: exc.errors}) from None
+        self.errors.pop(key, None)
+        return value
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.data!r})"
+
+
+class ValidatingList(ValidatingView, Sequence):
+    """A :class:`.ValidatingView` over a list
+
+    Iteration yields valid elements only, errors of invalid elements
+    are collected in :attr:`errors`.
+    """
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return super().__getitem__(index)
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self)):
+            try:
+                yield self[index]
+            except ValidationErrors:
+                continue
+
+
+class ValidatingDict(ValidatingView, Mapping):
+    """A :class:`.ValidatingView` over a dictionary
+
+    :meth:`items` and :meth:`values` yield valid elements only, errors of
+    invalid elements are collected in :attr:`errors`.
+    """
+
+    def __iter__(self) -> Iterator:
+        return iter(self.data)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:  # type: ignore
+        for key in self.data:
+            try:
+                yield key, self[key]
+            except ValidationErrors:
+                continue
+
+    def values(self) -> Iterator:  # type: ignore
+        for _, value in self.items():
+            yield value
+
+
 def validate_dataclass(
     schema: type,
     data: Union[Dict[str, Any], MultiDict, Record],
@@ -219,39 +465,37 @@ def validate_dataclass(
     as_schema: bool = False,
     **kw,
 ) -> ValidatedData:
+    plan = validation_plan(schema)
     errors: Dict = {}
     cleaned: Dict = {}
-    try:
-        data = MultiDict(dict(data) if isinstance(data, Record) else data)
-    except TypeError:
-        raise ValidationErrors(OBJECT_EXPECTED)
-    for field in fields(schema):
+    data = as_mapping(data, multiple)
+    for field in plan.fields:
         try:
-            required = field.metadata.get(REQUIRED, True)
-            default = get_default(field)
-            if strict and default is not None and data.get(field.name) is None:
-                data[field.name] = default
+            default = None
+            if strict and data.get(field.name) is None:
+                default = field.default()
 
-            if field.name not in data and required and strict:
+            if default is None and field.name not in data and field.required and strict:
                 raise ValidationError(field.name, "required")
 
-            for name in field_ops(field):
-                if name not in data:
+            for name in field.ops:
+                if default is not None and name == field.name:
+                    value = field.collect(default, as_schema=as_schema)
+                elif name not in data:
                     continue
-
-                if multiple:
+                elif multiple:
                     values = data.getall(name)
                     if len(values) > 1:
                         collected = []
                         for v in values:
-                            v = collect_value(field, v)
+                            v = field.collect(v)
                             if v is not None:
                                 collected.append(v)
                         value = collected if collected else None
                     else:
-                        value = collect_value(field, values[0], as_schema=as_schema)
+                        value = field.collect(values[0], as_schema=as_schema)
                 else:
-                    value = collect_value(field, data[name], as_schema=as_schema)
+                    value = field.collect(data[name], as_schema=as_schema)
 
                 cleaned[name] = value
 
@@ -260,16 +504,33 @@ def validate_dataclass(
         except ValidationErrors as exc:
             errors[name] = exc.errors
 
-    if not errors:
-        validate = getattr(schema, "validate", None)
-        if validate:
-            validate(cleaned, errors)
+    if not errors and plan.validate:
+        plan.validate(cleaned, errors)
 
     if errors:
         raise ValidationErrors(errors)
     return schema(**cleaned) if as_schema else cleaned
 
 
+def as_mapping(data: Any, multiple: bool = False) -> Mapping:
+    """Return a mapping view of data without copying it when possible
+
+    A :class:`~multidict.MultiDict` is only created when `multiple` values
+    are requested and data does not support them already.
+    """
+    if isinstance(data, Record):
+        data = data._mapping
+    if multiple:
+        if isinstance(data, (MultiDict, MultiDictProxy)):
+            return data
+    elif isinstance(data, Mapping):
+        return data
+    try:
+        return MultiDict(data)
+    except TypeError:
+        raise ValidationErrors(OBJECT_EXPECTED)
+
+
 def collect_value(field: Field, value: Any, **kw) -> Any:
     if is_null(value):
         return None
@@ -285,6 +546,28 @@ def collect_value(field: Field, value: Any, **kw) -> Any:
     return post_process(value) if post_process else value
 
 
+def value_collector(field: Field) -> Callable[..., Any]:
+    """Same as :func:`collect_value` with field metadata and type resolved once"""
+    validator = field.metadata.get(VALIDATOR)
+    post_process = field.metadata.get(POST_PROCESS)
+    items = field.metadata.get(ITEMS)
+    type_info = cast(TypingInfo, TypingInfo.get(field.type)).with_discriminator(
+        field.metadata.get(DISCRIMINATOR)
+    )
+    if type_info.container and items is None:
+        items = as_field(type_info.element)
+
+    def collect(value: Any, **kw) -> Any:
+        if is_null(value):
+            return None
+        if validator:
+            value = validator(field, value)
+        value = validate(type_info, value, raise_on_errors=True, items=items, **kw)
+        return post_process(value) if post_process else value
+
+    return collect
+
+
 def is_null(value: Any) -> bool:
     return value is None or value == "NULL"
 
@@ -295,3 +578,10 @@ def get_default(field: Field) -> Any:
     else:
         value = field.default
     return value if value is not MISSING else None
+
+
+def default_getter(field: Field) -> Callable[[], Any]:
+    if field.default_factory is not MISSING:
+        return field.default_factory
+    default = None if field.default is MISSING else field.default
+    return lambda: default
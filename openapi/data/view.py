@@ -33,6 +33,7 @@ class DataView:
         multiple: bool = False,
         strict: bool = True,
         Error: Optional[type] = None,
+        lazy: bool = False,
     ) -> DataType:
         """Clean data using a given schema
 
@@ -42,9 +43,14 @@ class DataView:
         :param multiple: multiple values for a given key are acceptable
         :param strict: all required attributes in schema must be available
         :param Error: optional :class:`.Exception` class
+        :param lazy: return a :class:`.ValidatingView` for `List` and `Dict` schemas,
+            elements are validated on access and their errors collected in the
+            view `errors` attribute
         """
         type_info = self.get_schema(schema)
-        validated = validate(type_info, data, strict=strict, multiple=multiple)
+        validated = validate(
+            type_info, data, strict=strict, multiple=multiple, lazy=lazy
+        )
         if validated.errors:
             if Error:
                 raise Error
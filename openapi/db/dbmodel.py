@@ -1,25 +1,211 @@
+import asyncio
+import json
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union, cast
+from functools import lru_cache
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+from uuid import uuid4
 
+import sqlalchemy as sa
 from sqlalchemy import Column, Table, func, insert, select
-from sqlalchemy.sql import Select, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select, and_, or_
 from sqlalchemy.sql.dml import Delete, Insert, Update
 
+from ..data.db import unique_keys
 from ..db.container import Database
 from ..pagination import (
+    COUNT_CONCURRENT,
+    COUNT_SEQUENTIAL,
+    COUNT_WINDOW,
+    TOTAL_CAPPED,
+    TOTAL_ESTIMATE,
     Pagination,
     PaginationVisitor,
     Search,
     SearchVisitor,
+    TotalStrategy,
     fields_flip_sign,
 )
 from ..pagination.cursor import cursor_to_python
 from ..types import Connection, Record, Records
 
+# maximum number of bind parameters in a postgres statement
+MAX_BIND_PARAMETERS = 32767
+# maximum number of totals in the count cache
+COUNT_CACHE_SIZE = 1024
+COUNT_CACHE: Dict[str, Tuple[float, int]] = {}
 QueryType = Union[Delete, Select, Update]
 SelectUpdate = Union[Select, Update]
 
 
+def insert_records(records: List[Dict]) -> List[Dict]:
+    """Make sure all records have the same keys, missing ones are set to `None`
+
+    Records are copied only when their keys differ.
+    """
+    if not records:
+        return records
+    keys = records[0].keys()
+    if all(record.keys() == keys for record in records):
+        return records
+    cols: Set[str] = set()
+    for record in records:
+        cols.update(record)
+    new_records = []
+    for record in records:
+        if len(record) < len(cols):
+            record = record.copy()
+            missing = cols.difference(record)
+            for col in missing:
+                record[col] = None
+        new_records.append(record)
+    return new_records
+
+
+@lru_cache(None)
+def unique_columns(
+    table: Table, columns: FrozenSet[str], exact: bool = False
+) -> Optional[Tuple[str, ...]]:
+    """Columns of the primary key or of the first unique constraint or unique
+    index of a table which are contained in (or equal to, when `exact`)
+    a set of columns
+    """
+    for key in unique_keys(table):
+        names = frozenset(key)
+        if names == columns if exact else names <= columns:
+            return key
+    return None
+
+
+@lru_cache(None)
+def required_columns(table: Table) -> FrozenSet[str]:
+    """Columns of a table which must be given when inserting a row"""
+    return frozenset(
+        column.name
+        for column in table.columns
+        if not column.nullable
+        and column.default is None
+        and column.server_default is None
+        and column is not table.autoincrement_column
+    )
+
+
+def upsert_query(
+    table: Table,
+    values: Optional[Dict],
+    target: Tuple[str, ...],
+    *,
+    update: Optional[Sequence[str]] = None,
+    keys: Iterable[str] = (),
+) -> Insert:
+    sql_query = pg_insert(table)
+    if values is not None:
+        sql_query = sql_query.values(values)
+        keys = values
+    if update is None:
+        update = [key for key in keys if key not in target]
+    # a no-op update when there is nothing to update so that the row is returned
+    set_: Dict[str, Any] = {
+        name: sql_query.excluded[name] for name in update or target[:1]
+    }
+    if update:
+        # columns with an onupdate default are updated as with an UPDATE statement
+        for column in table.columns:
+            if column.onupdate is not None and column.name not in set_:
+                set_[column.name] = onupdate_value(column.onupdate)
+    return sql_query.on_conflict_do_update(index_elements=target, set_=set_).returning(
+        *table.columns
+    )
+
+
+def onupdate_value(default: Any) -> Any:
+    """The value of an ``onupdate`` column default"""
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
+
+
+class CopyPlan(NamedTuple):
+    """Columns and row conversion for a ``COPY`` into a table"""
+
+    columns: Tuple[str, ...]
+    row: Callable[[Dict], Tuple]
+
+
+@lru_cache(None)
+def copy_plan(table: Table, columns: Tuple[str, ...], dialect: Any) -> CopyPlan:
+    """Build the :class:`.CopyPlan` for given table columns
+
+    Columns with a python-side default which are not in `columns`
+    are added to the plan.
+    """
+    defaults = [
+        (column.name, column.default)
+        for column in table.columns
+        if column.name not in columns
+        and column.default is not None
+        and not column.default.is_sequence
+        and not column.default.is_clause_element
+    ]
+    names = columns + tuple(name for name, _ in defaults)
+    processors = tuple(
+        (index, processor)
+        for index, processor in enumerate(
+            table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+            for name in names
+        )
+        if processor is not None
+    )
+
+    def row(record: Dict) -> Tuple:
+        values = [record.get(name) for name in columns]
+        for _, default in defaults:
+            values.append(default.arg(None) if default.is_callable else default.arg)
+        for index, processor in processors:
+            values[index] = processor(values[index])
+        return tuple(values)
+
+    return CopyPlan(columns=names, row=row)
+
+
+class Explain(Executable, ClauseElement):
+    """An ``EXPLAIN (FORMAT JSON)`` statement for a query"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def count_cache_key(sql_query: Select, dialect: Any, strategy: TotalStrategy) -> str:
+    """Cache key of a total, the compiled count query and its parameters"""
+    compiled = sql_query.compile(dialect=dialect)
+    params = sorted(compiled.params.items())
+    return f"{strategy.strategy}:{strategy.cap}:{compiled}:{params!r}"
+
+
 class CrudDB(Database):
     """A :class:`.Database` with additional methods for CRUD operations"""
 
@@ -99,22 +285,149 @@ class CrudDB(Database):
             result = await conn.execute(count_query)
             return result.scalar()
 
+    async def db_estimate_count_query(
+        self,
+        table: Table,
+        sql_query: Select,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> int:
+        """Estimate the number of rows of a query from planner statistics
+
+        The ``pg_class.reltuples`` statistic of the table is used when the
+        query has no filters, otherwise the row estimate of ``EXPLAIN``.
+        """
+        async with self.ensure_connection(conn) as conn:
+            if sql_query.whereclause is None:
+                result = await conn.execute(
+                    sa.text(
+                        "SELECT reltuples FROM pg_class "
+                        "WHERE oid = CAST(:name AS regclass)"
+                    ),
+                    dict(name=table.fullname),
+                )
+                reltuples = result.scalar()
+                # negative when the table has not been analyzed yet
+                if reltuples is not None and reltuples >= 0:
+                    return int(reltuples)
+            result = await conn.execute(Explain(sql_query))
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
     async def db_insert(
         self,
         table: Table,
         data: Union[List[Dict], Dict],
         *,
         conn: Optional[Connection] = None,
+        returning: bool = True,
     ) -> Records:
         """Perform an insert into a table
 
+        A list of records is inserted in a single executemany-style execution
+        within a transaction. Records are sent in pages sized by the number of
+        columns so that each statement is within the :data:`MAX_BIND_PARAMETERS`
+        limit.
+
         :param table: sqlalchemy Table
-        :param data: key-value pairs for columns values
+        :param data: key-value pairs for columns values or a list of them
         :param conn: optional db connection
+        :param returning: return the inserted rows
         """
         async with self.ensure_connection(conn) as conn:
-            sql_query = self.insert_query(table, data)
-            return await conn.execute(sql_query)
+            if isinstance(data, dict):
+                sql_query = insert(table).values(data)
+                if returning:
+                    sql_query = sql_query.returning(*table.columns)
+                return await conn.execute(sql_query)
+            records = insert_records(data)
+            sql_query = insert(table)
+            if returning:
+                sql_query = sql_query.returning(*table.columns)
+            page_size = MAX_BIND_PARAMETERS // max(len(records[0]), 1) if records else 1
+            sql_query = sql_query.execution_options(
+                insertmanyvalues_page_size=page_size
+            )
+            return await conn.execute(sql_query, records)
+
+    async def db_copy_insert(
+        self,
+        table: Table,
+        records: Iterable[Dict],
+        *,
+        columns: Optional[Sequence[str]] = None,
+        conn: Optional[Connection] = None,
+        staging: bool = False,
+        on_conflict_do_nothing: bool = False,
+        returning: bool = False,
+    ) -> Union[Records, int]:
+        """Bulk load records into a table with the binary ``COPY`` protocol
+
+        Values are converted with the bind processors of the table column types
+        and python-side column defaults are applied to columns not provided.
+        In staging mode rows are copied into a temporary table and moved into
+        the target table with an ``INSERT ... SELECT`` statement, which
+        allows for conflict handling and for returning the inserted rows.
+
+        :param table: sqlalchemy Table
+        :param records: an iterable over key-value pairs for columns values
+        :param columns: optional column names to load, if not provided they are
+            taken from the first record
+        :param conn: optional db connection
+        :param staging: copy into a temporary staging table first
+        :param on_conflict_do_nothing: skip rows which conflict with existing ones
+            (implies `staging`)
+        :param returning: return the inserted rows (implies `staging`)
+        :return: the inserted rows if `returning` is `True`, otherwise
+            the number of inserted rows
+        """
+        iterator = iter(records)
+        if columns is None:
+            first = next(iterator, None)
+            if first is None:
+                columns = [column.name for column in table.columns]
+            else:
+                columns = list(first)
+                iterator = chain((first,), iterator)
+        staging = staging or on_conflict_do_nothing or returning
+        async with self.ensure_transaction(conn) as conn:
+            plan = copy_plan(table, tuple(columns), conn.dialect)
+            target = table
+            if staging:
+                target = sa.table(f"staging_{uuid4().hex}")
+                preparer = conn.dialect.identifier_preparer
+                await conn.execute(
+                    sa.text(
+                        f"CREATE TEMPORARY TABLE {preparer.format_table(target)} "
+                        f"(LIKE {preparer.format_table(table)} INCLUDING DEFAULTS) "
+                        "ON COMMIT DROP"
+                    )
+                )
+            else:
+                # the driver transaction is started by the first statement,
+                # without it the COPY would be autocommitted
+                await conn.execute(sa.text("SELECT 1"))
+            raw = await conn.get_raw_connection()
+            status = await raw.driver_connection.copy_records_to_table(
+                target.name,
+                records=(plan.row(record) for record in iterator),
+                columns=plan.columns,
+                schema_name=None if staging else table.schema,
+            )
+            if not staging:
+                return int(status.split()[-1])
+            source = sa.table(target.name, *(sa.column(c) for c in plan.columns))
+            sql_query = pg_insert(table).from_select(
+                plan.columns, select(*source.columns)
+            )
+            if on_conflict_do_nothing:
+                sql_query = sql_query.on_conflict_do_nothing()
+            if returning:
+                return await conn.execute(sql_query.returning(*table.columns))
+            result = await conn.execute(sql_query)
+            return result.rowcount
 
     async def db_update(
         self,
@@ -157,12 +470,29 @@ class CrudDB(Database):
     ) -> Record:
         """Perform an upsert for a single record
 
+        When the `filters` columns match the primary key or a unique constraint
+        of the table and the record can be inserted (all required columns are
+        given), the upsert is a single ``INSERT ... ON CONFLICT DO UPDATE``
+        statement, otherwise the record is updated (or selected when there is no
+        `data`) and inserted if not found.
+
         :param table: sqlalchemy Table
         :param filters: key-value pairs for filtering rows to update
         :param data: key-value pairs for updating columns values of selected rows
         :param conn: optional db connection
         :param consumer: optional consumer (see :meth:`.get_query`)
         """
+        target = None
+        if consumer is None and not any(
+            isinstance(value, (list, tuple)) for value in filters.values()
+        ):
+            target = unique_columns(table, frozenset(filters), exact=True)
+        values = {**(data or {}), **filters}
+        if target is not None and required_columns(table) <= values.keys():
+            sql_query = upsert_query(table, values, target)
+            async with self.ensure_connection(conn) as conn:
+                result = await conn.execute(sql_query)
+                return result.one()
         if data:
             result = await self.db_update(
                 table, filters, data, conn=conn, consumer=consumer
@@ -177,6 +507,49 @@ class CrudDB(Database):
             record = result.one()
         return record
 
+    async def db_upsert_many(
+        self,
+        table: Table,
+        records: List[Dict],
+        *,
+        conflict: Optional[Sequence[str]] = None,
+        update: Optional[Sequence[str]] = None,
+        conn: Optional[Connection] = None,
+    ) -> Records:
+        """Upsert many records with ``INSERT ... ON CONFLICT DO UPDATE`` statements
+
+        Records are sent in pages as in :meth:`.db_insert`. Records
+        within a page must not conflict with each other.
+
+        :param table: sqlalchemy Table
+        :param records: list of key-value pairs for columns values
+        :param conflict: optional columns of the conflict target, if not provided
+            it is the primary key or the first unique constraint with all
+            columns in the records
+        :param update: optional columns to update on conflict, if not provided
+            all record columns not in the conflict target are updated
+        :param conn: optional db connection
+        :return: the inserted or updated rows
+        """
+        if not records:
+            async with self.ensure_connection(conn) as conn:
+                return await conn.execute(select(*table.columns).where(sa.false()))
+        records = insert_records(records)
+        keys = frozenset(records[0])
+        target = tuple(conflict) if conflict else unique_columns(table, keys)
+        if target is None:
+            raise ValueError(
+                f"no primary key or unique constraint of {table.name} "
+                f"in columns {', '.join(sorted(keys))}"
+            )
+        sql_query = upsert_query(table, None, target, update=update, keys=keys)
+        page_size = MAX_BIND_PARAMETERS // max(len(keys), 1)
+        async with self.ensure_connection(conn) as conn:
+            return await conn.execute(
+                sql_query.execution_options(insertmanyvalues_page_size=page_size),
+                records,
+            )
+
     async def db_paginate(
         self,
         table: Table,
@@ -189,6 +562,8 @@ class CrudDB(Database):
             db=self, table=table, sql_query=sql_query
         )
         pagination.apply(pagination_visitor)
+        if pagination_visitor.count_mode == COUNT_CONCURRENT and conn is None:
+            return await pagination_visitor.execute_concurrent()
         async with self.ensure_connection(conn) as conn:
             return await pagination_visitor.execute(conn)
 
@@ -198,18 +573,7 @@ class CrudDB(Database):
         if isinstance(records, dict):
             records = [records]
         else:
-            cols: Set[str] = set()
-            for record in records:
-                cols.update(record)
-            new_records = []
-            for record in records:
-                if len(record) < len(cols):
-                    record = record.copy()
-                    missing = cols.difference(record)
-                    for col in missing:
-                        record[col] = None
-                new_records.append(record)
-            records = new_records
+            records = insert_records(records)
         return insert(table).values(records).returning(*table.columns)
 
     # backward compatibility
@@ -365,14 +729,22 @@ class DbPaginationVisitor(PaginationVisitor):
     table: Table
     sql_query: Select
     initial_sql: Optional[QueryType] = None
+    count_mode: str = COUNT_SEQUENTIAL
+    total_strategy: TotalStrategy = TotalStrategy()
+    offset: int = 0
 
     def apply_offset_pagination(
         self,
         limit: int,
         offset: int,
         order_by: Optional[Union[str, Sequence[str]]],
+        count_mode: str = COUNT_SEQUENTIAL,
+        total_strategy: TotalStrategy = TotalStrategy(),
     ) -> None:
         self.initial_sql = self.sql_query
+        self.count_mode = count_mode
+        self.total_strategy = total_strategy
+        self.offset = offset
         sql_query = self.db.order_by_query(self.table, self.sql_query, order_by)
         if offset:
             sql_query = sql_query.offset(offset)
@@ -387,30 +759,117 @@ class DbPaginationVisitor(PaginationVisitor):
         order_by: Sequence[str],
         previous: bool = False,
     ) -> None:
-        sql_query = self.sql_query
-        for key, value in cursor:
-            sql_query = sql_query.where(self.filter(key, value, previous))
-        extra = 1
         if previous:
-            extra += 1
             order_by = fields_flip_sign(order_by)
+        sql_query = self.sql_query
+        if cursor:
+            sql_query = sql_query.where(
+                self.keyset_filter(order_by, [value for _, value in cursor])
+            )
+        # one extra row to know if there is another page
         self.sql_query = self.db.order_by_query(self.table, sql_query, order_by).limit(
-            limit + extra
+            limit + 1
         )
 
     async def execute(self, conn: Connection) -> Tuple[Records, Optional[int]]:
-        total = None
-        if self.initial_sql is not None:
-            total = await self.db.db_count_query(self.initial_sql, conn=conn)
+        if self.initial_sql is None:
+            return await conn.execute(self.sql_query), None
+        if self.count_mode == COUNT_WINDOW:
+            return await self.execute_window(conn)
+        total = await self.count(conn)
         values = await conn.execute(self.sql_query)
         return values, total
 
-    def filter(self, field: str, value: str, previous: bool) -> Column:
-        if field.startswith("-"):
-            field = field[1:]
-            op = "ge" if previous else "le"
+    async def execute_concurrent(self) -> Tuple[Records, Optional[int]]:
+        """Execute the count and page queries concurrently on separate connections"""
+
+        async def page() -> Records:
+            async with self.db.ensure_connection() as conn:
+                return await conn.execute(self.sql_query)
+
+        async def count() -> int:
+            async with self.db.ensure_connection() as conn:
+                return await self.count(conn)
+
+        values, total = await asyncio.gather(page(), count())
+        return values, total
+
+    async def count(self, conn: Connection) -> int:
+        """Compute the total number of rows with the :class:`.TotalStrategy`"""
+        sql_query = cast(Select, self.initial_sql)
+        strategy = self.total_strategy
+        key = None
+        if strategy.ttl:
+            key = count_cache_key(sql_query, conn.dialect, strategy)
+            cached = COUNT_CACHE.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+        if strategy.strategy == TOTAL_ESTIMATE:
+            total = await self.db.db_estimate_count_query(
+                self.table, sql_query, conn=conn
+            )
+        elif strategy.strategy == TOTAL_CAPPED:
+            total = await self.db.db_count_query(
+                sql_query.limit(strategy.cap), conn=conn
+            )
         else:
-            op = "le" if previous else "ge"
-        column = getattr(self.table.c, field)
-        py_value = cursor_to_python(column.type.python_type, value)
-        return self.db.default_filter_field(column, op, py_value)
+            total = await self.db.db_count_query(sql_query, conn=conn)
+        if key:
+            if len(COUNT_CACHE) >= COUNT_CACHE_SIZE:
+                COUNT_CACHE.clear()
+            COUNT_CACHE[key] = (time.monotonic() + strategy.ttl, total)
+        return total
+
+    async def execute_window(self, conn: Connection) -> Tuple[Records, Optional[int]]:
+        """Execute the page query with a ``COUNT(*) OVER ()`` column for the total"""
+        sql_query = cast(Select, self.sql_query)
+        size = len(sql_query.selected_columns)
+        result = await conn.execute(
+            sql_query.add_columns(func.count().over().label("_total_count"))
+        )
+        frozen = result.freeze()
+        row = frozen().first()
+        if row is not None:
+            total = row[size]
+        elif self.offset:
+            # the page is past the last row, the total must be counted
+            total = await self.db.db_count_query(self.initial_sql, conn=conn)
+        else:
+            total = 0
+        return cast(Records, frozen().columns(*range(size))), total
+
+    def keyset_filter(self, order_by: Sequence[str], values: Sequence[Any]) -> Any:
+        """Filter the rows strictly after the cursor values in the given ordering
+
+        When all fields are ordered in the same direction this is a single row
+        value comparison, ``(a, b) > (:a, :b)``, which can use a composite index.
+        Mixed directions are expanded into
+        ``a > :a OR (a = :a AND b < :b)``.
+        """
+        columns = []
+        literals = []
+        descending = []
+        for field, value in zip(order_by, values):
+            desc = field.startswith("-")
+            column = getattr(self.table.c, field[1:] if desc else field)
+            py_value = cursor_to_python(column.type.python_type, value)
+            columns.append(column)
+            literals.append(sa.literal(py_value, column.type))
+            descending.append(desc)
+        if len(set(descending)) == 1:
+            if len(columns) == 1:
+                left, right = columns[0], literals[0]
+            else:
+                left, right = sa.tuple_(*columns), sa.tuple_(*literals)
+            return left < right if descending[0] else left > right
+        return or_(
+            *(
+                and_(
+                    *(c == v for c, v in zip(columns[:index], literals[:index])),
+                    column < value if desc else column > value,
+                )
+                for index, (column, value, desc) in enumerate(
+                    zip(columns, literals, descending)
+                )
+            )
+        )
@@ -1,18 +1,22 @@
 import re
-from typing import List, Optional, Tuple, cast
+from dataclasses import is_dataclass
+from typing import List, Optional, Sequence, Tuple, cast
 
 import sqlalchemy as sa
 from aiohttp import web
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import Select
 
-from openapi.data.validate import ValidationErrors
+from openapi.data.dump import dump_rows
+from openapi.data.validate import ValidationErrors, validate_many
 
 from ..pagination import PaginatedData, Pagination, Search, create_dataclass
-from ..spec.path import ApiPath
+from ..spec.path import ApiPath, StreamErrors
 from ..types import Connection, DataType, Record, Records, SchemaTypeOrStr, StrDict
+from ..utils import as_list
 from .dbmodel import CrudDB
 
+STREAM_BATCH_SIZE = 1000
 unique_regex = re.compile(r"Key \((?P<column>(\w+,? ?)+)\)=\((?P<value>.+)\)")
 
 
@@ -92,8 +96,9 @@ class SqlApiPath(ApiPath):
             )
         except ValidationErrors as e:
             self.raise_validation_error(errors=e.errors)
-        data = cast(List[StrDict], self.dump(dump_schema, values.all()))
-        return pagination.paginated(self.full_url(), data, total)
+        rows = values.all()
+        data = cast(List[StrDict], self.dump_rows(dump_schema, rows))
+        return pagination.paginated(self.full_url(), data, total, rows=rows)
 
     async def create_one(
         self,
@@ -144,10 +149,73 @@ class SqlApiPath(ApiPath):
             )
         schema = self.get_schema(body_schema)
         assert schema.container is list
-        data = [self.insert_data(d, body_schema=schema.element) for d in data]
+        validated = validate_many(schema.element, data)
+        if validated.errors:
+            self.raise_validation_error(errors=validated.errors)
+        data = validated.data
+        if self.path_schema:
+            path = self.cleaned("path_schema", self.request.match_info)
+            for d in data:
+                d.update(path)
         values = await self.db.db_insert(table, data, conn=conn)
         return self.dump(dump_schema, values.all())
 
+    async def create_stream(
+        self,
+        *,
+        table: Optional[sa.Table] = None,
+        body_schema: SchemaTypeOrStr = "body_schema",
+        batch_size: int = STREAM_BATCH_SIZE,
+        max_errors: int = 100,
+        conn: Optional[Connection] = None,
+    ) -> StrDict:
+        """Create multiple models from a streamed JSON array or NDJSON request body
+
+        Items are validated as they are read (see :meth:`.json_stream`), valid
+        items are inserted in batches within a single transaction and invalid
+        items are rejected.
+
+        :param table: sqlalchemy table, if not given it uses the
+            default :attr:`db_table`
+        :param body_schema: the schema to validate items against
+        :param batch_size: number of rows inserted by each insert statement
+        :param max_errors: maximum number of errors reported
+        :param conn: optional db connection
+        :return: a dictionary with the number of `accepted` and `rejected` items
+            and the `errors` of (up to `max_errors`) rejected items
+        """
+        table = table if table is not None else self.db_table
+        path = {}
+        if self.path_schema:
+            path = self.cleaned("path_schema", self.request.match_info)
+        errors = StreamErrors(max_errors)
+        accepted = 0
+        batch: List[StrDict] = []
+        async with self.db.ensure_transaction(conn) as conn:
+            try:
+                async for data in self.json_stream(
+                    body_schema=body_schema, errors=errors
+                ):
+                    data.update(path)
+                    batch.append(data)
+                    if len(batch) == batch_size:
+                        await self.db.db_insert(
+                            table, batch, conn=conn, returning=False
+                        )
+                        accepted += len(batch)
+                        batch = []
+                if batch:
+                    await self.db.db_insert(table, batch, conn=conn, returning=False)
+                    accepted += len(batch)
+            except IntegrityError as exc:
+                self.handle_unique_violation(exc)
+                raise
+        return dict(
+            accepted=accepted,
+            rejected=errors.count,
+            errors=as_list(errors),
+        )
+
     async def get_one(
         self,
         *,
@@ -247,6 +315,21 @@ class SqlApiPath(ApiPath):
         )
         return await self.db.db_delete(table, filters, conn=conn, consumer=self)
 
+    def dump_rows(self, schema: SchemaTypeOrStr, rows: Sequence[Record]) -> DataType:
+        """Dump a sequence of database rows
+
+        When the schema is a list of dataclasses, column values are read from
+        rows by position, otherwise it falls back to :meth:`.dump`.
+
+        :param schema: a schema or an the name of an attribute in :class:`.Operation`
+        :param rows: rows to dump
+        """
+        if schema is not None:
+            type_info = self.get_schema(schema)
+            if type_info.container is list and is_dataclass(type_info.element):
+                return dump_rows(type_info.element, rows)
+        return self.dump(schema, rows)
+
     def handle_unique_violation(self, exception: IntegrityError):
         match = re.search(unique_regex, str(exception))
         if match:
@@ -1,11 +1,36 @@
+"""JSON encoding and decoding
+
+The functions in this module delegate to a configurable JSON backend.
+Backends follow the semantics below, deviations are documented
+in the backend class:
+
+* JSON numbers with a fractional part are decoded as :class:`~decimal.Decimal`
+  and :class:`~decimal.Decimal` values are encoded as JSON numbers
+* :class:`~uuid.UUID` values are encoded as hex strings
+* :class:`~datetime.datetime` values are encoded as ISO-8601 strings
+* :class:`~enum.Enum` values are encoded with their name
+* iterables are encoded as arrays
+
+The backend is selected via the ``JSON_BACKEND`` environment variable
+or by calling :func:`set_backend`.
+"""
+import codecs
+import json
+import os
+import re
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
-from functools import partial
+from typing import Any, Dict, List, Union
 from uuid import UUID
 
 import simplejson
 from simplejson.errors import JSONDecodeError
 
+JSON_BACKEND = os.environ.get("JSON_BACKEND") or "simplejson"
+
+JsonInput = Union[str, bytes]
+
 
 def encoder(obj):
     if isinstance(obj, UUID):
@@ -17,9 +42,232 @@ def encoder(obj):
     raise TypeError
 
 
-loads = partial(simplejson.loads, use_decimal=True)
-dumps = partial(
-    simplejson.dumps, use_decimal=True, default=encoder, iterable_as_array=True
-)
+class JsonBackend:
+    """Base class for JSON backends"""
+
+    name: str = ""
+
+    def loads(self, data: JsonInput, **kwargs) -> Any:
+        """Decode a JSON document"""
+        raise NotImplementedError
+
+    def dumps(self, data: Any, **kwargs) -> str:
+        """Encode data as a JSON string"""
+        raise NotImplementedError
+
+    def dumps_bytes(self, data: Any, **kwargs) -> bytes:
+        """Encode data as UTF-8 encoded JSON bytes"""
+        return self.dumps(data, **kwargs).encode("utf-8")
+
+    def __repr__(self) -> str:
+        return self.name
+
+    __str__ = __repr__
+
+
+class SimpleJsonBackend(JsonBackend):
+    """The default backend, it uses the simplejson library"""
+
+    name = "simplejson"
+
+    def loads(self, data: JsonInput, **kwargs) -> Any:
+        return simplejson.loads(data, use_decimal=True, **kwargs)
+
+    def dumps(self, data: Any, **kwargs) -> str:
+        return simplejson.dumps(
+            data, use_decimal=True, default=encoder, iterable_as_array=True, **kwargs
+        )
+
+
+# encodes decimals exactly, used when the standard library finds decimals
+exact_backend = SimpleJsonBackend()
+
+
+class DecimalFound(Exception):
+    """Raised when the standard library encoder finds a decimal"""
+
+
+class StdJsonBackend(JsonBackend):
+    """A backend using the standard library :mod:`json` module.
+
+    Documents without decimals are encoded by the C encoder of the standard
+    library, which is faster than simplejson. The standard library cannot
+    encode :class:`~decimal.Decimal` values without going through float,
+    encoding therefore stops at the first decimal and the document is
+    encoded with simplejson: documents containing decimals get no speedup.
+    """
+
+    name = "json"
+
+    def loads(self, data: JsonInput, **kwargs) -> Any:
+        try:
+            return json.loads(data, parse_float=Decimal, **kwargs)
+        except json.JSONDecodeError as exc:
+            raise JSONDecodeError(exc.msg, exc.doc, exc.pos) from None
+
+    def dumps(self, data: Any, **kwargs) -> str:
+        try:
+            return json.dumps(data, default=self.default, **kwargs)
+        except DecimalFound:
+            return exact_backend.dumps(data, **kwargs)
+
+    @staticmethod
+    def default(obj: Any) -> Any:
+        if isinstance(obj, Decimal):
+            raise DecimalFound
+        try:
+            return encoder(obj)
+        except TypeError:
+            try:
+                return list(obj)
+            except TypeError:
+                raise TypeError(
+                    f"Object of type {type(obj).__name__} is not JSON serializable"
+                ) from None
+
+
+BACKENDS: Dict[str, Any] = {
+    SimpleJsonBackend.name: SimpleJsonBackend,
+    StdJsonBackend.name: StdJsonBackend,
+}
+
+
+def register_backend(Backend: Any) -> None:
+    """Register a new JSON backend
+
+    :param Backend: a :class:`.JsonBackend` subclass
+    """
+    BACKENDS[Backend.name] = Backend
+
+
+def set_backend(backend: Union[str, JsonBackend]) -> JsonBackend:
+    """Set the JSON backend used by :func:`.loads` and :func:`.dumps`
+
+    :param backend: name of a registered backend or a :class:`.JsonBackend`
+    """
+    global _backend
+    if isinstance(backend, str):
+        Backend = BACKENDS.get(backend)
+        if Backend is None:
+            raise ValueError(f"JSON backend {backend} not available")
+        try:
+            backend = Backend()
+        except ImportError as exc:
+            raise ValueError(f"JSON backend {backend} not available: {exc}") from None
+    _backend = backend
+    return _backend
+
+
+def get_backend() -> JsonBackend:
+    """The JSON backend in use"""
+    return _backend
+
+
+def loads(data: JsonInput, **kwargs) -> Any:
+    """Decode a JSON document with the current backend"""
+    return _backend.loads(data, **kwargs)
+
+
+def dumps(data: Any, **kwargs) -> str:
+    """Encode data into a JSON string with the current backend"""
+    return _backend.dumps(data, **kwargs)
+
+
+def dumps_bytes(data: Any, **kwargs) -> bytes:
+    """Encode data into UTF-8 encoded JSON bytes with the current backend"""
+    return _backend.dumps_bytes(data, **kwargs)
+
+
+class JsonArrayDecoder:
+    """Incremental decoder of a top level JSON array
+
+    Bytes are passed to :meth:`feed` as they arrive and the array
+    items completed so far are returned, so that only incomplete items
+    are kept in memory. Items are decoded with the standard library decoder
+    and numbers with a fractional part as :class:`~decimal.Decimal`.
+
+    :param max_item_size: maximum number of characters of an incomplete
+        item kept in memory, 0 for no limit
+    """
+
+    def __init__(self, max_item_size: int = 0) -> None:
+        self.max_item_size = max_item_size
+        self.buffer = ""
+        self.state = "start"
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder(parse_float=Decimal)
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        """Feed a chunk of bytes and return the decoded items
+
+        :param data: chunk of bytes
+        :param final: `True` when this is the last chunk
+        :raise JSONDecodeError: when data is not a valid JSON array
+            or an item exceeds the maximum item size
+        """
+        buffer = self.buffer + self.text.decode(data, final)
+        size = len(buffer)
+        items = []
+        pos = 0
+        while True:
+            pos = _skip_whitespace(buffer, pos).end()
+            if pos == size:
+                break
+            char = buffer[pos]
+            if self.state == "start":
+                if char != "[":
+                    raise JSONDecodeError("Expecting '['", buffer, pos)
+                self.state = "first"
+                pos += 1
+            elif self.state == "end":
+                raise JSONDecodeError("Extra data", buffer, pos)
+            elif char == "]" and self.state in ("first", "separator"):
+                self.state = "end"
+                pos += 1
+            elif self.state == "separator":
+                if char != ",":
+                    raise JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                self.state = "value"
+                pos += 1
+            else:
+                try:
+                    value, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if final:
+                        raise JSONDecodeError(exc.msg, exc.doc, exc.pos) from None
+                    break
+                # a number followed only by number characters at the end
+                # of the buffer may continue in the next chunk
+                if (
+                    not final
+                    and isinstance(value, (int, Decimal))
+                    and _number_tail(buffer, end).end() == size
+                ):
+                    break
+                items.append(value)
+                self.state = "separator"
+                pos = end
+        self.buffer = buffer[pos:]
+        if self.max_item_size and len(self.buffer) > self.max_item_size:
+            raise JSONDecodeError("Item exceeds maximum size", buffer, pos)
+        if final and self.state != "end":
+            raise JSONDecodeError("Unterminated array", buffer, pos)
+        return items
+
+
+_skip_whitespace = re.compile(r"[ \t\n\r]*").match
+_number_tail = re.compile(r"[0-9.eE+\-]*").match
+_backend: JsonBackend = set_backend(JSON_BACKEND)
+
 
-__all__ = ["loads", "dumps", "JSONDecodeError"]
+__all__ = [
+    "loads",
+    "dumps",
+    "dumps_bytes",
+    "JSONDecodeError",
+    "JsonBackend",
+    "JsonArrayDecoder",
+    "get_backend",
+    "set_backend",
+    "register_backend",
+]
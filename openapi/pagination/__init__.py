@@ -1,10 +1,29 @@
 from .create import create_dataclass
 from .cursor import cursorPagination
 from .offset import offsetPagination
-from .pagination import PaginatedData, Pagination, PaginationVisitor, fields_flip_sign
+from .pagination import (
+    COUNT_CONCURRENT,
+    COUNT_SEQUENTIAL,
+    COUNT_WINDOW,
+    TOTAL_CAPPED,
+    TOTAL_ESTIMATE,
+    TOTAL_EXACT,
+    PaginatedData,
+    Pagination,
+    PaginationVisitor,
+    TotalStrategy,
+    fields_flip_sign,
+)
 from .search import Search, SearchVisitor, searchable
 
 __all__ = [
+    "COUNT_CONCURRENT",
+    "COUNT_SEQUENTIAL",
+    "COUNT_WINDOW",
+    "TOTAL_CAPPED",
+    "TOTAL_ESTIMATE",
+    "TOTAL_EXACT",
+    "TotalStrategy",
     "Pagination",
     "PaginatedData",
     "PaginationVisitor",
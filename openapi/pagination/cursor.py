@@ -1,15 +1,23 @@
 import base64
+import hashlib
+import hmac
+import os
+import struct
+import warnings
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
 from functools import cached_property
-from typing import Any, Dict, Optional, Tuple, Type
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+from uuid import UUID
 
-from dateutil.parser import parse as parse_date
+from sqlalchemy import Table
 from yarl import URL
 
-from openapi import json
+from openapi.data.db import unique_keys
 from openapi.data.fields import Choice, integer_field, str_field
 from openapi.data.validate import ValidationErrors
+from openapi.tz import parse_date, parse_datetime
 
 from .pagination import (
     DEF_PAGINATION_LIMIT,
@@ -21,39 +29,244 @@ from .pagination import (
     from_filters_and_dataclass,
 )
 
-CursorType = Tuple[Tuple[str, str], ...]
+CURSOR_SECRET = os.environ.get("CURSOR_SECRET") or ""
+CURSOR_VERSION = 1
+SIGNATURE_SIZE = 16
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
 
+CursorType = Tuple[Tuple[str, Any], ...]
+PyTypes = Tuple[Optional[type], ...]
 
-def encode_cursor(data: Tuple[str, ...], previous: bool = False) -> str:
-    cursor_bytes = json.dumps((data, previous)).encode("ascii")
-    base64_bytes = base64.b64encode(cursor_bytes)
-    return base64_bytes.decode("ascii")
+
+def _pack_uint(value: int, out: bytearray) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    # zigzag encoding so that small negative numbers are small too
+    _pack_uint(value * 2 if value >= 0 else -value * 2 - 1, out)
+
+
+def _unpack_uint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _unpack_int(data: bytes, pos: int) -> Tuple[int, int]:
+    value, pos = _unpack_uint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _micros(delta: timedelta) -> int:
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _pack_value(value: Any, out: bytearray) -> None:
+    if value is None:
+        out += b"n"
+    elif isinstance(value, bool):
+        out += b"T" if value else b"F"
+    elif isinstance(value, int):
+        out += b"i"
+        _pack_int(value, out)
+    elif isinstance(value, Decimal) and value.is_finite():
+        sign, digits, exponent = value.as_tuple()
+        coefficient = int("".join(map(str, digits)) or "0")
+        out += b"d"
+        _pack_int(-coefficient if sign else coefficient, out)
+        _pack_int(exponent, out)
+    elif isinstance(value, float):
+        out += b"f"
+        out += struct.pack(">d", value)
+    elif isinstance(value, UUID):
+        out += b"u"
+        out += value.bytes
+    elif isinstance(value, datetime):
+        if value.tzinfo is None:
+            out += b"m"
+            _pack_int(_micros(value - NAIVE_EPOCH), out)
+        else:
+            out += b"z"
+            _pack_int(_micros(value - EPOCH), out)
+    elif isinstance(value, date):
+        out += b"D"
+        _pack_uint(value.toordinal(), out)
+    else:
+        text = str(value).encode("utf-8")
+        out += b"s"
+        _pack_uint(len(text), out)
+        out += text
+
+
+def _unpack_value(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos : pos + 1]
+    pos += 1
+    if tag == b"n":
+        return None, pos
+    elif tag in (b"T", b"F"):
+        return tag == b"T", pos
+    elif tag == b"i":
+        return _unpack_int(data, pos)
+    elif tag == b"d":
+        coefficient, pos = _unpack_int(data, pos)
+        exponent, pos = _unpack_int(data, pos)
+        digits = tuple(map(int, str(abs(coefficient))))
+        return Decimal((int(coefficient < 0), digits, exponent)), pos
+    elif tag == b"f":
+        return struct.unpack_from(">d", data, pos)[0], pos + 8
+    elif tag == b"u":
+        return UUID(bytes=data[pos : pos + 16]), pos + 16
+    elif tag in (b"m", b"z"):
+        micros, pos = _unpack_int(data, pos)
+        epoch = NAIVE_EPOCH if tag == b"m" else EPOCH
+        return epoch + timedelta(microseconds=micros), pos
+    elif tag == b"D":
+        ordinal, pos = _unpack_uint(data, pos)
+        return date.fromordinal(ordinal), pos
+    elif tag == b"s":
+        size, pos = _unpack_uint(data, pos)
+        return data[pos : pos + size].decode("utf-8"), pos + size
+    raise ValueError(f"invalid cursor tag {tag!r}")
+
+
+def _signature(secret: str, payload: bytes) -> bytes:
+    return hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).digest()[
+        :SIGNATURE_SIZE
+    ]
+
+
+def encode_cursor(
+    data: Tuple[Any, ...], previous: bool = False, secret: str = ""
+) -> str:
+    """Encode cursor values into a compact URL-safe string
+
+    Values are packed in a binary format with a type tag for
+    int, :class:`~decimal.Decimal`, :class:`~uuid.UUID`, datetime, date
+    and str values (other values are packed as strings).
+
+    :param data: cursor values
+    :param previous: `True` for a cursor to the previous page
+    :param secret: when provided the cursor is signed with HMAC-SHA256
+    """
+    out = bytearray((CURSOR_VERSION << 1 | previous,))
+    for value in data:
+        _pack_value(value, out)
+    if secret:
+        out += _signature(secret, bytes(out))
+    return base64.urlsafe_b64encode(out).rstrip(b"=").decode("ascii")
 
 
 def decode_cursor(
-    cursor: Optional[str], field_names: Tuple[str]
+    cursor: Optional[str],
+    field_names: Tuple[str, ...],
+    secret: str = "",
+    types: PyTypes = (),
 ) -> Tuple[CursorType, bool]:
-    try:
-        if cursor:
-            base64_bytes = cursor.encode("ascii")
-            cursor_bytes = base64.b64decode(base64_bytes)
-            values, previous = json.loads(cursor_bytes)
-            if len(values) == len(field_names):
-                return tuple(zip(field_names, values)), previous
-            raise ValueError
+    """Decode a cursor created with :func:`.encode_cursor`
+
+    :param cursor: the encoded cursor
+    :param field_names: names of the cursor fields
+    :param secret: secret used to sign the cursor
+    :param types: python types of the cursor fields, values of a different
+        type are converted with :func:`.cursor_to_python`
+    :raise ValidationErrors: when the cursor is not valid
+    """
+    if not cursor:
         return (), False
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        if secret:
+            data, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+            if not hmac.compare_digest(signature, _signature(secret, data)):
+                raise ValueError("invalid cursor signature")
+        if data[0] >> 1 != CURSOR_VERSION:
+            raise ValueError("invalid cursor version")
+        values: List[Any] = []
+        pos = 1
+        while pos < len(data):
+            value, pos = _unpack_value(data, pos)
+            values.append(value)
+        if pos != len(data) or len(values) != len(field_names):
+            raise ValueError("invalid cursor values")
+        if types:
+            values = [
+                value if py_type is None else cursor_to_python(py_type, value)
+                for value, py_type in zip(values, types)
+            ]
+        return tuple(zip(field_names, values)), bool(data[0] & 1)
+    except ValidationErrors:
+        raise
     except Exception as e:
         raise ValidationErrors("invalid cursor") from e
 
 
+def column_types(table: Optional[Table], field_names: Tuple[str, ...]) -> PyTypes:
+    """Python types of the table columns used as cursor fields"""
+    if table is None:
+        return ()
+    types: List[Optional[type]] = []
+    for name in field_names:
+        try:
+            types.append(table.c[name].type.python_type)
+        except NotImplementedError:
+            types.append(None)
+    return tuple(types)
+
+
+def table_tiebreaker(table: Table, field_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Columns of the primary key or unique constraint of a table with
+    the fewest columns missing from the ordering fields
+    """
+    keys = unique_keys(table)
+    if not keys:
+        raise ValueError(f"table {table.name} has no primary key or unique constraint")
+    key = min(keys, key=lambda key: sum(name not in field_names for name in key))
+    return tuple(name for name in key if name not in field_names)
+
+
+class CursorCodec(NamedTuple):
+    """Encode and decode cursors of a :func:`.cursorPagination`"""
+
+    field_names: Tuple[str, ...]
+    types: PyTypes = ()
+    secret: str = ""
+
+    def encode(self, record: Any, previous: bool = False) -> str:
+        """Encode the cursor of a record"""
+        values = start_values(record, self.field_names)
+        if self.types:
+            values = tuple(
+                value if py_type is None else cursor_to_python(py_type, value)
+                for value, py_type in zip(values, self.types)
+            )
+        return encode_cursor(values, previous=previous, secret=self.secret)
+
+    def decode(
+        self, cursor: Optional[str], order_by: Tuple[str, ...]
+    ) -> Tuple[CursorType, bool]:
+        """Decode a cursor into ordering fields and values"""
+        return decode_cursor(cursor, order_by, secret=self.secret, types=self.types)
+
+
 def cursor_url(url: URL, cursor: str) -> URL:
     query = url.query.copy()
     query.update(_cursor=cursor)
     return url.with_query(query)
 
 
-def start_values(record: dict, field_names: Tuple[str, ...]) -> Tuple[str, ...]:
-    """start values for pagination"""
+def start_values(record: Any, field_names: Tuple[str, ...]) -> Tuple[Any, ...]:
+    """start values for pagination from a database row or a dictionary"""
+    record = getattr(record, "_mapping", record)
     return tuple(record[field] for field in field_names)
 
 
@@ -61,11 +274,53 @@ def cursorPagination(
     *order_by_fields: str,
     default_limit: int = DEF_PAGINATION_LIMIT,
     max_limit: int = MAX_PAGINATION_LIMIT,
+    tiebreaker: str = "",
+    table: Optional[Table] = None,
+    secret: str = CURSOR_SECRET,
 ) -> Type[Pagination]:
+    """Create a cursor :class:`.Pagination` dataclass
+
+    Pages are selected with a strict keyset comparison on the ordering fields,
+    therefore the ordering fields should be completed with a unique tiebreaker
+    and their values must not be null. Cursors are built from the database
+    rows, the ordering fields don't need to be in the response schema.
+
+    :param order_by_fields: fields used for ordering
+    :param default_limit: default number of objects returned
+    :param max_limit: maximum number of objects returned
+    :param tiebreaker: a unique field appended to the ordering fields
+        (with the direction of the last one). When neither `tiebreaker` nor
+        `table` is given a warning is issued and the ordering fields are
+        assumed to be unique, rows tying at a page boundary are skipped otherwise
+    :param table: optional table the python types of the ordering fields
+        are taken from, cursor values are converted to these types. When
+        `tiebreaker` is not given, the columns of the primary key or of a unique
+        constraint missing from the ordering fields are used as tiebreaker
+    :param secret: secret used to sign cursors, by default the
+        ``CURSOR_SECRET`` environment variable
+    """
     if len(order_by_fields) == 0:
         raise ValueError("orderable_fields must be specified")
+    if tiebreaker:
+        tiebreakers: Tuple[str, ...] = (tiebreaker,)
+    elif table is not None:
+        tiebreakers = table_tiebreaker(table, fields_no_sign(order_by_fields))
+    else:
+        warnings.warn(
+            "cursorPagination without a tiebreaker or a table skips rows "
+            "tying at a page boundary unless the ordering fields are unique",
+            stacklevel=2,
+        )
+        tiebreakers = ()
+    sign = "-" if order_by_fields[-1].startswith("-") else ""
+    order_by_fields += tuple(
+        f"{sign}{name}"
+        for name in tiebreakers
+        if name not in fields_no_sign(order_by_fields)
+    )
 
     field_names = fields_no_sign(order_by_fields)
+    codec = CursorCodec(field_names, column_types(table, field_names), secret)
 
     @dataclass
     class CursorPagination(Pagination):
@@ -94,7 +349,7 @@ def cursorPagination(
                 if self.direction == "desc"
                 else order_by_fields
             )
-            cursor, previous = decode_cursor(self._cursor, order_by)
+            cursor, previous = codec.decode(self._cursor, order_by)
             return cursor, order_by, previous
 
         @property
@@ -115,57 +370,53 @@ def cursorPagination(
             return from_filters_and_dataclass(CursorPagination, data)
 
         def links(
-            self, url: URL, data: list, total: Optional[int] = None
+            self, url: URL, data: Sequence, total: Optional[int] = None
         ) -> Dict[str, str]:
             links = {}
+            limit = self.limit
+            # data is in query order, which is reversed for previous pages
             if self.previous:
-                if len(data) > self.limit + 1:
+                if len(data) > limit:
                     links["prev"] = cursor_url(
-                        url,
-                        encode_cursor(
-                            start_values(data[self.limit], field_names), previous=True
-                        ),
-                    )
-                if self._cursor:
-                    links["next"] = cursor_url(
-                        url,
-                        encode_cursor(
-                            start_values(data[0], field_names),
-                        ),
+                        url, codec.encode(data[limit - 1], previous=True)
                     )
+                if data:
+                    links["next"] = cursor_url(url, codec.encode(data[0]))
             else:
-                if len(data) > self.limit:
-                    links["next"] = cursor_url(
-                        url,
-                        encode_cursor(start_values(data[self.limit], field_names)),
-                    )
-                if self._cursor:
+                if len(data) > limit:
+                    links["next"] = cursor_url(url, codec.encode(data[limit - 1]))
+                if self._cursor and data:
                     links["prev"] = cursor_url(
-                        url,
-                        encode_cursor(
-                            start_values(data[0], field_names),
-                            previous=True,
-                        ),
+                        url, codec.encode(data[0], previous=True)
                     )
             return links
 
         def get_data(self, data: list) -> list:
             if self.previous:
-                data = list(reversed(data[1:]))
-                return data if len(data) <= self.limit else data[1:]
-            return data if len(data) <= self.limit else data[: self.limit]
+                return list(reversed(data[: self.limit]))
+            return data[: self.limit]
 
     return CursorPagination
 
 
 def cursor_to_python(py_type: Type, value: Any) -> Any:
+    """Convert a cursor value to a given python type
+
+    Values which are already of the given type are returned as they are.
+    """
+    if type(value) is py_type:
+        return value
     try:
         if py_type is datetime:
-            return parse_date(value)
+            return parse_datetime(value)
         elif py_type is date:
-            return parse_date(value).date()
+            return value.date() if isinstance(value, datetime) else parse_date(value)
         elif py_type is int:
             return int(value)
+        elif py_type is Decimal:
+            return Decimal(value)
+        elif py_type is UUID:
+            return UUID(str(value))
         else:
             return value
     except Exception as e:
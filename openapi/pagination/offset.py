@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, NamedTuple, Optional, Type
+from typing import Dict, NamedTuple, Optional, Sequence, Type
 
 from multidict import MultiDict
 from yarl import URL
@@ -8,10 +8,17 @@ from openapi.data.fields import Choice, integer_field, str_field
 from openapi.utils import docjoin
 
 from .pagination import (
+    COUNT_MODES,
+    COUNT_SEQUENTIAL,
+    COUNT_WINDOW,
     DEF_PAGINATION_LIMIT,
     MAX_PAGINATION_LIMIT,
+    TOTAL_CAPPED,
+    TOTAL_EXACT,
+    TOTAL_STRATEGIES,
     Pagination,
     PaginationVisitor,
+    TotalStrategy,
     from_filters_and_dataclass,
 )
 
@@ -20,10 +27,48 @@ def offsetPagination(
     *order_by_fields: str,
     default_limit: int = DEF_PAGINATION_LIMIT,
     max_limit: int = MAX_PAGINATION_LIMIT,
+    count_mode: str = COUNT_SEQUENTIAL,
+    total_strategy: str = TOTAL_EXACT,
+    total_cap: int = 1000,
+    total_cache_ttl: float = 0,
 ) -> Type[Pagination]:
-    """Crate a limit/offset :class:`.Pagination` dataclass"""
+    """Crate a limit/offset :class:`.Pagination` dataclass
+
+    :param order_by_fields: fields which can be used for ordering
+    :param default_limit: default number of objects returned
+    :param max_limit: maximum number of objects returned
+    :param count_mode: how the total number of objects is counted:
+
+        * ``sequential`` a count query followed by the page query
+        * ``concurrent`` the count and page queries run concurrently
+          on separate connections
+        * ``window`` a single page query with a ``COUNT(*) OVER ()`` column
+    :param total_strategy: how the total number of objects is computed:
+
+        * ``exact`` a ``COUNT(*)`` of all matching rows
+        * ``estimate`` the planner estimate, from ``pg_class.reltuples`` when
+          the query has no filters or from the ``EXPLAIN`` row estimate
+        * ``capped`` an exact count of up to ``total_cap`` rows
+    :param total_cap: maximum number of rows counted by the ``capped`` strategy
+    :param total_cache_ttl: seconds totals are cached for, keyed by the compiled
+        count query and its parameters, 0 (default) for no caching
+    """
     if len(order_by_fields) == 0:
         raise ValueError("orderable_fields must be specified")
+    if count_mode not in COUNT_MODES:
+        raise ValueError(
+            f"count_mode must be one of {', '.join(COUNT_MODES)}, got {count_mode}"
+        )
+    if total_strategy not in TOTAL_STRATEGIES:
+        raise ValueError(
+            f"total_strategy must be one of {', '.join(TOTAL_STRATEGIES)}, "
+            f"got {total_strategy}"
+        )
+    if total_strategy == TOTAL_CAPPED and total_cap < 1:
+        raise ValueError("total_cap must be a positive integer")
+    strategy = TotalStrategy(total_strategy, total_cap, total_cache_ttl)
+    if count_mode == COUNT_WINDOW and strategy != TotalStrategy(cap=total_cap):
+        raise ValueError("window count_mode supports exact totals only")
 
     @dataclass
     class OffsetPagination(Pagination):
@@ -52,7 +97,11 @@ def offsetPagination(
 
         def apply(self, visitor: PaginationVisitor) -> None:
             visitor.apply_offset_pagination(
-                limit=self.limit, offset=self.offset, order_by=self.order_by
+                limit=self.limit,
+                offset=self.offset,
+                order_by=self.order_by,
+                count_mode=count_mode,
+                total_strategy=strategy,
             )
 
         @classmethod
@@ -60,13 +109,16 @@ def offsetPagination(
             return from_filters_and_dataclass(OffsetPagination, data)
 
         def links(
-            self, url: URL, data: list, total: Optional[int] = None
+            self, url: URL, data: Sequence, total: Optional[int] = None
         ) -> Dict[str, str]:
             """Return links for paginated data"""
             return Links(url=url, query=MultiDict(url.query)).links(
                 total, self.limit, self.offset
             )
 
+        def total_is_exact(self, total: Optional[int]) -> bool:
+            return strategy.is_exact(total)
+
     return OffsetPagination
 
 
@@ -15,19 +15,58 @@ from typing import (
 from aiohttp import web
 from yarl import URL
 
-from openapi.json import dumps
+from ..spec.path import json_response
 
 MAX_PAGINATION_LIMIT: int = int(os.environ.get("MAX_PAGINATION_LIMIT") or 100)
 DEF_PAGINATION_LIMIT: int = int(os.environ.get("DEF_PAGINATION_LIMIT") or 50)
+# how the total number of rows is counted in offset pagination
+COUNT_SEQUENTIAL = "sequential"
+COUNT_CONCURRENT = "concurrent"
+COUNT_WINDOW = "window"
+COUNT_MODES = (COUNT_SEQUENTIAL, COUNT_CONCURRENT, COUNT_WINDOW)
+# how the total number of rows is computed in offset pagination
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+TOTAL_CAPPED = "capped"
+TOTAL_STRATEGIES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_CAPPED)
+
+
+class TotalStrategy(NamedTuple):
+    """How the total number of rows is computed in offset pagination"""
+
+    strategy: str = TOTAL_EXACT
+    """One of :data:`TOTAL_STRATEGIES`"""
+    cap: int = 0
+    """Maximum number of rows counted by the ``capped`` strategy"""
+    ttl: float = 0
+    """Seconds a total is cached for, keyed by the count query, 0 for no caching"""
+
+    def is_exact(self, total: Optional[int]) -> bool:
+        """Whether a total computed with this strategy is an exact count"""
+        if total is None or self.ttl:
+            return False
+        if self.strategy == TOTAL_CAPPED:
+            return total < self.cap
+        return self.strategy == TOTAL_EXACT
 
 
 class PaginationVisitor:
     """Visitor for pagination"""
 
     def apply_offset_pagination(
-        self, limit: int, offset: int, order_by: Union[str, List[str]]
+        self,
+        limit: int,
+        offset: int,
+        order_by: Union[str, List[str]],
+        count_mode: str = COUNT_SEQUENTIAL,
+        total_strategy: TotalStrategy = TotalStrategy(),
     ):
-        """Apply limit/offset pagination"""
+        """Apply limit/offset pagination
+
+        :param count_mode: how the total number of rows is counted,
+            one of :data:`COUNT_MODES`
+        :param total_strategy: how the total number of rows is computed
+        """
         raise NotImplementedError
 
     def apply_cursor_pagination(
@@ -77,17 +116,31 @@ class Pagination:
         pass
 
     def paginated(
-        self, url: URL, data: list, total: Optional[int] = None
+        self,
+        url: URL,
+        data: list,
+        total: Optional[int] = None,
+        rows: Optional[Sequence] = None,
     ) -> "PaginatedData":
-        """Return paginated data"""
-        return PaginatedData(url=url, data=data, pagination=self, total=total)
+        """Return paginated data
+
+        :param rows: optional database rows the data was dumped from,
+            links are built from them when provided
+        """
+        return PaginatedData(
+            url=url, data=data, pagination=self, total=total, rows=rows
+        )
 
     def links(
-        self, url: URL, data: list, total: Optional[int] = None
+        self, url: URL, data: Sequence, total: Optional[int] = None
     ) -> Dict[str, str]:
-        """Return links for paginated data"""
+        """Return links for paginated data or for the rows it was dumped from"""
         return {}
 
+    def total_is_exact(self, total: Optional[int]) -> bool:
+        """Whether the total number of records is an exact count"""
+        return total is not None
+
     def get_data(self, data: list) -> list:
         return data
 
@@ -105,21 +158,32 @@ class PaginatedData(NamedTuple):
     """Pagination dataclass which created the data"""
     total: Optional[int] = None
     """Total number of records (supported by limit/offset pagination only)"""
-
-    def json_response(self, headers: Optional[Dict[str, str]] = None, **kwargs):
-        """Create a JSON response with link header"""
+    rows: Optional[Sequence] = None
+    """Database rows the data was dumped from"""
+
+    def json_response(
+        self, headers: Optional[Dict[str, str]] = None, **kwargs
+    ) -> web.Response:
+        """Create a JSON response with link header
+
+        When the total is available it is set in the ``X-Total-Count`` header
+        and the ``X-Total-Count-Exact`` header is ``false`` when the total
+        is an estimate, a capped count or a cached value.
+        """
         headers = headers or {}
         links = self.header_links()
         if links:
             headers["Link"] = links
         if self.total is not None:
             headers["X-Total-Count"] = str(self.total)
-        kwargs.setdefault("dumps", dumps)
-        return web.json_response(
+            exact = self.pagination.total_is_exact(self.total)
+            headers["X-Total-Count-Exact"] = "true" if exact else "false"
+        return json_response(
             self.pagination.get_data(self.data), headers=headers, **kwargs
         )
 
     def header_links(self) -> str:
         """Header links"""
-        links = self.pagination.links(self.url, self.data, self.total)
+        data = self.data if self.rows is None else self.rows
+        links = self.pagination.links(self.url, data, self.total)
         return ", ".join(f'<{value}>; rel="{name}"' for name, value in links.items())
@@ -25,8 +25,8 @@ def rest(
             OpenApi(**(openapi or {})),
             allowed_tags=allowed_tags,
             validate_docs=validate_docs,
-            servers=servers,
-            security=security,
+            servers=servers or [],
+            security=security or {},
             redoc=redoc,
         )
     return OpenApiClient(
@@ -1,17 +1,39 @@
-from typing import Any, Dict, Optional
+import os
+from typing import Any, AsyncIterator, Callable, Dict, Optional, cast
 
 from aiohttp import web
+from aiohttp.typedefs import LooseHeaders
 from multidict import MultiDict
 from yarl import URL
 
-from openapi.json import dumps, loads
+from openapi.json import JsonArrayDecoder, JSONDecodeError, dumps, dumps_bytes, loads
 
-from ..data.validate import ValidationErrors
+from ..data.validate import ValidationErrors, validate
 from ..data.view import BAD_DATA_MESSAGE, DataView, ErrorType
 from ..types import DataType, QueryType, SchemaTypeOrStr
-from ..utils import compact
+from ..utils import TypingInfo, compact
 from . import hdrs
 
+NDJSON_CONTENT_TYPES = frozenset(("application/x-ndjson", "application/jsonl"))
+STREAM_CHUNK_SIZE = 65536
+STREAM_MAX_ITEM_SIZE = int(os.environ.get("STREAM_MAX_ITEM_SIZE") or 1048576)
+
+
+class StreamErrors(dict):
+    """Errors of invalid streamed items which keeps the first `limit` errors
+    only, :attr:`count` is the number of errors added
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self.limit = limit
+        self.count = 0
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.count += 1
+        if len(self) < self.limit:
+            super().__setitem__(key, value)
+
 
 class ApiPath(web.View, DataView):
     """A :class:`.DataView` class for OpenAPI path"""
@@ -83,6 +105,84 @@ class ApiPath(web.View, DataView):
         except Exception:
             self.raise_bad_data()
 
+    async def json_stream(
+        self,
+        *,
+        body_schema: Optional[SchemaTypeOrStr] = "body_schema",
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        max_item_size: int = STREAM_MAX_ITEM_SIZE,
+        errors: Optional[Dict[int, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """Iterate over the items of a JSON array or NDJSON request body.
+
+        The body is read from the request stream in chunks and items are
+        validated and yielded as they are decoded, so that the request body
+        is never fully loaded into memory.
+
+        :param body_schema: the schema to validate items against, if it is a `List`
+            its element is used. If `None` items are not validated
+        :param chunk_size: size of the chunks read from the request stream
+        :param max_item_size: maximum size of an item (or NDJSON line),
+            0 for no limit
+        :param errors: optional dictionary (or :class:`.StreamErrors`) where
+            errors of invalid items are collected, keyed by the item index.
+            When provided, invalid items are skipped rather than raising an error
+        :raise HTTPBadRequest: when body data is not valid UTF-8 encoded JSON
+            or an item exceeds the maximum item size
+        :raise HTTPUnprocessableEntity: when an item is not valid, errors
+            are keyed by the item index
+        """
+        type_info = None
+        if body_schema is not None:
+            type_info = self.get_schema(body_schema)
+            if type_info.container is list:
+                type_info = cast(TypingInfo, TypingInfo.get(type_info.element))
+        index = 0
+        try:
+            async for item in self._json_items(chunk_size, max_item_size):
+                if type_info is not None:
+                    validated = validate(type_info, item)
+                    if validated.errors:
+                        if errors is None:
+                            self.raise_validation_error(
+                                errors={index: validated.errors}
+                            )
+                        errors[index] = validated.errors
+                        index += 1
+                        continue
+                    item = validated.data
+                yield item
+                index += 1
+        except (JSONDecodeError, UnicodeDecodeError):
+            self.raise_bad_data()
+
+    async def _json_items(
+        self, chunk_size: int, max_item_size: int
+    ) -> AsyncIterator[Any]:
+        content = self.request.content
+        if self.request.content_type in NDJSON_CONTENT_TYPES:
+            pending = b""
+            while True:
+                chunk = await content.read(chunk_size)
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop() if chunk else b""
+                for line in lines + [pending]:
+                    if max_item_size and len(line) > max_item_size:
+                        raise JSONDecodeError("Item exceeds maximum size", "", 0)
+                for line in lines:
+                    if line.strip():
+                        yield loads(line)
+                if not chunk:
+                    break
+        else:
+            decoder = JsonArrayDecoder(max_item_size)
+            while True:
+                chunk = await content.read(chunk_size)
+                for item in decoder.feed(chunk, final=not chunk):
+                    yield item
+                if not chunk:
+                    break
+
     def validation_error(
         self, message: str = "", errors: Optional[ErrorType] = None
     ) -> Exception:
@@ -107,8 +207,32 @@ class ApiPath(web.View, DataView):
 
     @classmethod
     def json_response(cls, data, **kwargs):
-        kwargs.setdefault("dumps", dumps)
-        return web.json_response(data, **kwargs)
+        return json_response(data, **kwargs)
+
+
+def json_response(
+    data: Any,
+    *,
+    status: int = 200,
+    reason: Optional[str] = None,
+    headers: Optional[LooseHeaders] = None,
+    content_type: str = "application/json",
+    dumps: Optional[Callable[[Any], str]] = None,
+) -> web.Response:
+    """Create a JSON response
+
+    Data is serialized directly into the response body bytes, without an
+    intermediate string unless a custom `dumps` function is provided.
+    The `Content-Length` header is set from the body size.
+    """
+    return web.Response(
+        body=dumps_bytes(data) if dumps is None else dumps(data).encode("utf-8"),
+        status=status,
+        reason=reason,
+        headers=headers,
+        content_type=content_type,
+        charset="utf-8",
+    )
 
 
 def full_url(request) -> URL:
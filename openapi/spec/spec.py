@@ -1,22 +1,46 @@
+import gzip
+import hashlib
 import os
 from collections import OrderedDict
+from copy import deepcopy
 from dataclasses import MISSING, Field, asdict, dataclass, field
 from dataclasses import fields as get_fields
 from dataclasses import is_dataclass
 from enum import Enum
-from typing import Any, Dict, Iterable, List, Optional, Set, Type, Union, cast
-
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+import yaml
 from aiohttp import hdrs, web
+from aiohttp.helpers import ETAG_ANY
 
 from ..data import fields
 from ..data.exc import ErrorMessage, FieldError, ValidationErrors, error_response_schema
+from ..data.validate import discriminator_mapping
 from ..exc import InvalidSpecException, InvalidTypeException
+from ..json import dumps_bytes
 from ..utils import TypingInfo, compact, is_subclass
 from .path import ApiPath
 from .redoc import Redoc
 from .server import default_server
 from .utils import load_yaml_from_docstring, trim_docstring
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
 OPENAPI = "3.0.3"
 METHODS = [method.lower() for method in hdrs.METH_ALL]
 SCHEMAS_TO_SCHEMA = ("response_schema", "body_schema")
@@ -24,6 +48,12 @@ SCHEMA_BASE_REF = "#/components/schemas/"
 
 EMPTY_DEFAULTS = frozenset((None, MISSING, ""))
 SPEC_ROUTE = os.environ.get("SPEC_ROUTE", "/spec")
+SPEC_FILE = os.environ.get("SPEC_FILE", "")
+SPEC_CACHE = "spec_cache"
+# maximum number of server urls spec documents are cached for
+SPEC_CACHE_SIZE = 16
+# process-wide cache of dataclass JSON schemas and the schemas they reference
+SCHEMA_CACHE: Dict[Tuple[type, type, bool], Tuple[Dict, Dict[str, type]]] = {}
 
 
 @dataclass
@@ -55,6 +85,63 @@ class OpenApiInfo:
 OpenApi = OpenApiInfo
 
 
+class SpecDocument(NamedTuple):
+    """A serialized OpenAPI spec document"""
+
+    body: bytes
+    """JSON encoded spec"""
+    etag: str
+    """Entity tag of the JSON body"""
+    encoded: Dict[str, bytes] = {}
+    """Compressed variants of the body, keyed by content encoding"""
+
+    @classmethod
+    def from_doc(cls, doc: Dict, compress: bool = False) -> "SpecDocument":
+        return cls.from_body(dumps_bytes(doc), compress=compress)
+
+    @classmethod
+    def from_file(cls, path: str, compress: bool = False) -> "SpecDocument":
+        """Load a pre-generated spec document from a JSON or YAML file"""
+        with open(path, "rb") as fp:
+            body = fp.read()
+        if path.endswith((".yaml", ".yml")):
+            return cls.from_doc(yaml.safe_load(body), compress=compress)
+        return cls.from_body(body, compress=compress)
+
+    @classmethod
+    def from_body(cls, body: bytes, compress: bool = False) -> "SpecDocument":
+        encoded = {}
+        if compress:
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body)
+            encoded["gzip"] = gzip.compress(body)
+        return cls(body=body, etag=hashlib.sha256(body).hexdigest(), encoded=encoded)
+
+    def encoding_etag(self, encoding: Optional[str] = None) -> str:
+        """The entity tag of the body in a given content encoding"""
+        return f"{self.etag}-{encoding}" if encoding else self.etag
+
+    def content_encoding(self, request: web.Request) -> Optional[str]:
+        """The precompressed content encoding accepted by the request, if any"""
+        if not self.encoded:
+            return None
+        accepted = set()
+        for value in request.headers.get(hdrs.ACCEPT_ENCODING, "").split(","):
+            bits = value.strip().lower().split(";")
+            if not any(b.strip() in ("q=0", "q=0.0") for b in bits[1:]):
+                accepted.add(bits[0])
+        for encoding in self.encoded:
+            if encoding in accepted:
+                return encoding
+        return None
+
+
+class SpecRequest(NamedTuple):
+    """Stand-in for a request when building the spec outside a request"""
+
+    app: web.Application
+
+
 @dataclass
 class OpenApiSpec:
     """Open API Specification"""
@@ -71,6 +158,18 @@ class OpenApiSpec:
     """the path serving the JSON openpi specification"""
     redoc: Optional[Redoc] = None
     """Optional object for rendering the specification as an HTML page via redoc"""
+    cache: bool = True
+    """Cache the serialized spec document, per application and server url"""
+    precompute: bool = False
+    """Build, validate and compress the spec document at application startup.
+
+    When :attr:`servers` are not provided, the document uses a server url
+    relative to the location of the spec, so that it does not depend on the request
+    """
+    spec_file: str = SPEC_FILE
+    """Optional path of a pre-generated spec document (JSON or YAML) to serve
+    rather than building the spec from the application routes
+    (see the ``spec export`` command)"""
 
     def routes(self, request: web.Request) -> Iterable:
         """Routes to include in the spec"""
@@ -78,18 +177,112 @@ class OpenApiSpec:
 
     def setup_app(self, app: web.Application):
         app["spec"] = self
+        app[SPEC_CACHE] = OrderedDict()
         app.router.add_get(self.spec_url, self.spec_route, name="openapi_spec")
         if self.redoc:
             app.router.add_get(self.redoc.path, self.redoc.handle_doc)
+        if self.precompute or self.spec_file:
+            app.on_startup.append(self.on_startup)
+
+    async def on_startup(self, app: web.Application) -> None:
+        """Build, or load from :attr:`spec_file`, the spec document when
+        the application starts
+
+        Invalid specs raise :class:`.InvalidSpecException` at startup.
+        """
+        if self.spec_file:
+            spec_doc = SpecDocument.from_file(self.spec_file, compress=True)
+        else:
+            spec_doc = SpecDocument.from_doc(self.build_app(app), compress=True)
+        app[SPEC_CACHE][None] = spec_doc
+
+    def build_app(self, app: web.Application) -> Dict:
+        """Build the spec document of an application outside a request
+
+        When :attr:`servers` are not provided, the server url is
+        relative to the location of the spec.
+        """
+        servers = None
+        if not self.servers:
+            servers = [dict(url=app["cli"].base_path or "/", description="Api server")]
+        return self.build(cast(web.Request, SpecRequest(app)), servers=servers)
 
     async def spec_route(self, request: web.Request) -> web.Response:
-        """Return the OpenApi spec"""
-        return web.json_response(self.build(request))
+        """Return the OpenApi spec
 
-    def build(self, request: web.Request) -> Dict:
+        The response carries an `ETag` header, different for each content
+        encoding, requests with an `If-None-Match` header matching any encoding
+        receive a `304 Not Modified` response.
+        """
+        spec_doc = self.spec_document(request)
+        encoding = spec_doc.content_encoding(request)
+        valid = {spec_doc.encoding_etag(name) for name in (None, *spec_doc.encoded)}
+        valid.add(ETAG_ANY)
+        etags = request.if_none_match or ()
+        if any(etag.value in valid for etag in etags):
+            response = web.Response(status=304)
+        else:
+            response = web.Response(
+                body=spec_doc.encoded[encoding] if encoding else spec_doc.body,
+                content_type="application/json",
+                charset="utf-8",
+            )
+            if encoding:
+                response.headers[hdrs.CONTENT_ENCODING] = encoding
+        if spec_doc.encoded:
+            response.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        response.etag = spec_doc.encoding_etag(encoding)
+        return response
+
+    def spec_document(self, request: web.Request) -> SpecDocument:
+        """The serialized spec document for a request
+
+        When :attr:`cache` is enabled the document is built once
+        for each value of :meth:`cache_key`, the documents of the
+        :data:`SPEC_CACHE_SIZE` most recently used keys are kept.
+        The document built at startup, when :attr:`precompute` is enabled or
+        :attr:`spec_file` is provided, is always used.
+        """
+        cache = request.app.get(SPEC_CACHE)
+        if cache is not None and (self.precompute or self.spec_file):
+            spec_doc = cache.get(None)
+            if spec_doc is not None:
+                return spec_doc
+        if cache is None or not self.cache:
+            return self.create_document(request)
+        key = self.cache_key(request)
+        spec_doc = cache.get(key)
+        if spec_doc is None:
+            spec_doc = self.create_document(request, compress=True)
+            cache[key] = spec_doc
+            if len(cache) > SPEC_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return spec_doc
+
+    def create_document(
+        self, request: web.Request, compress: bool = False
+    ) -> SpecDocument:
+        if self.spec_file:
+            return SpecDocument.from_file(self.spec_file, compress=compress)
+        return SpecDocument.from_doc(self.build(request), compress=compress)
+
+    def cache_key(self, request: web.Request) -> Optional[str]:
+        """The part of the request the spec document depends on
+
+        This is the server url when :attr:`servers` are not provided
+        and the spec is neither precomputed nor loaded from a file, `None` otherwise
+        """
+        if self.servers or self.precompute or self.spec_file:
+            return None
+        return default_server(request)["url"]
+
+    def build(self, request: web.Request, servers: Optional[List[Dict]] = None) -> Dict:
         doc = SpecDoc(request, self)
         security = self.security.copy()
-        servers = self.servers[:] if self.servers else []
+        if servers is None:
+            servers = self.servers[:] if self.servers else []
         return doc(security, servers)
 
 
@@ -125,7 +318,10 @@ class SchemaParser:
         if meta.get(fields.HIDDEN):
             return {}
         items = meta.get(fields.ITEMS)
-        json_property = self.get_schema_info(field.type, items=items)
+        type_info = cast(TypingInfo, TypingInfo.get(field.type))
+        json_property = self.get_schema_info(
+            type_info.with_discriminator(meta.get(fields.DISCRIMINATOR)), items=items
+        )
         field_description = meta.get(fields.DESCRIPTION)
         if not field_description:
             if self.validate_docs and validate:
@@ -145,16 +341,36 @@ class SchemaParser:
         return json_property
 
     def dataclass2json(self, schema: Any) -> Dict[str, Any]:
-        """Extract the object representation of a dataclass schema"""
+        """Extract the object representation of a dataclass schema
+
+        The representation is cached for the lifetime of the process,
+        a copy of the cached value is returned.
+        """
         type_info = cast(TypingInfo, TypingInfo.get(schema))
         if not type_info or not type_info.is_dataclass:
             raise InvalidSpecException(
                 "Schema must be a dataclass, got "
                 f"{type_info.element if type_info else None}"
             )
+        key = (type(self), type_info.element, self.validate_docs)
+        cached = SCHEMA_CACHE.get(key)
+        if cached is None:
+            to_parse, self.schemas_to_parse = self.schemas_to_parse, {}
+            try:
+                json_schema = self._dataclass2json(type_info.element)
+                cached = (json_schema, self.schemas_to_parse)
+            finally:
+                to_parse.update(self.schemas_to_parse)
+                self.schemas_to_parse = to_parse
+            SCHEMA_CACHE[key] = cached
+        else:
+            self.schemas_to_parse.update(cached[1])
+        return deepcopy(cached[0])
+
+    def _dataclass2json(self, schema: type) -> Dict[str, Any]:
         properties = {}
         required = []
-        for item in get_fields(type_info.element):
+        for item in get_fields(schema):
             json_property = self.field2json(item)
             field_required = json_property.pop("required", True)
             if not json_property:
@@ -207,7 +423,13 @@ class SchemaParser:
                     required = False
                 else:
                     one_of.append(self.get_schema_info(e))
-            info = one_of[0] if len(one_of) == 1 else {"oneOf": one_of}
+            if type_info.discriminator:
+                info = {
+                    "oneOf": one_of,
+                    "discriminator": self.get_discriminator_info(type_info),
+                }
+            else:
+                info = one_of[0] if len(one_of) == 1 else {"oneOf": one_of}
             info["required"] = required
             return info
         elif type_info.is_dataclass:
@@ -216,6 +438,16 @@ class SchemaParser:
         else:
             return self.get_primitive_info(type_info.element)
 
+    def get_discriminator_info(self, type_info: TypingInfo) -> Dict[str, Any]:
+        mapping = discriminator_mapping(type_info.element, type_info.discriminator)
+        return {
+            "propertyName": type_info.discriminator,
+            "mapping": {
+                str(tag): self.get_schema_info(member)["$ref"]
+                for tag, member in mapping.items()
+            },
+        }
+
     def get_primitive_info(self, schema: Type) -> Dict[str, Any]:
         mapping = fields.PRIMITIVE_TYPES.get(schema)
         if not mapping:
@@ -1,5 +1,8 @@
 import re
-from typing import Dict, Optional
+from copy import deepcopy
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 import yaml
 
@@ -45,7 +48,15 @@ def dedent(content: str) -> str:
 
 
 def load_yaml_from_docstring(docstring: str) -> Optional[Dict]:
-    """Loads YAML from docstring."""
+    """Loads YAML from docstring.
+
+    Parsed docstrings are cached, a copy of the cached value is returned.
+    """
+    return deepcopy(_load_yaml_from_docstring(docstring))
+
+
+@lru_cache(None)
+def _load_yaml_from_docstring(docstring: str) -> Optional[Dict]:
     split_lines = trim_docstring(docstring).split("\n")
 
     # Cut YAML from rest of docstring
@@ -63,3 +74,17 @@ def load_yaml_from_docstring(docstring: str) -> Optional[Dict]:
         return yaml.load(yaml_string, Loader=yaml.FullLoader)
     except Exception as e:
         raise InvalidSpecException("Invalid yaml %s" % e) from None
+
+
+class SpecDumper(yaml.SafeDumper):
+    """YAML dumper for spec documents"""
+
+
+SpecDumper.add_representer(
+    Decimal, lambda dumper, data: dumper.represent_float(float(data))
+)
+
+
+def dump_yaml(doc: Any) -> str:
+    """Dump a JSON-compatible spec document into a YAML string"""
+    return yaml.dump(doc, Dumper=SpecDumper, sort_keys=False, allow_unicode=True)
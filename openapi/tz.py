@@ -1,6 +1,14 @@
-from datetime import datetime, timezone
+import os
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from dateutil.parser import parse as dateutil_parse
+
+from .utils import str2bool
 
 UTC = timezone.utc
+# when true, strings which are not valid ISO-8601 are parsed with dateutil
+LOOSE_DATE_PARSING = str2bool(os.environ.get("LOOSE_DATE_PARSING", "yes"))
 
 
 def utcnow() -> datetime:
@@ -9,3 +17,43 @@ def utcnow() -> datetime:
 
 def as_utc(dt: datetime) -> datetime:
     return dt.replace(tzinfo=UTC)
+
+
+def parse_datetime(value: str, loose: Optional[bool] = None) -> datetime:
+    """Parse a string into a datetime
+
+    ISO-8601 strings, including the ``Z`` suffix for UTC, are parsed with
+    :meth:`datetime.fromisoformat`, other formats are parsed with dateutil
+    only when `loose` parsing is enabled.
+
+    :param value: string to parse
+    :param loose: enable dateutil parsing, if not provided it
+        defaults to :data:`LOOSE_DATE_PARSING`
+    :raise ValueError: when the string cannot be parsed or it has both
+        an UTC offset and the ``Z`` suffix
+    """
+    utc = value[-1:] in ("Z", "z")
+    try:
+        dt = datetime.fromisoformat(value[:-1] if utc else value)
+    except ValueError:
+        if not (LOOSE_DATE_PARSING if loose is None else loose):
+            raise
+        return dateutil_parse(value)
+    if utc:
+        if dt.tzinfo is not None:
+            raise ValueError(f"invalid datetime {value}: both offset and Z suffix")
+        dt = dt.replace(tzinfo=UTC)
+    return dt
+
+
+def parse_date(value: str, loose: Optional[bool] = None) -> date:
+    """Parse a string into a date
+
+    Same as :func:`parse_datetime` but it returns a date
+    """
+    if len(value) == 10:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return parse_datetime(value, loose=loose).date()
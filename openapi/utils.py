@@ -1,5 +1,6 @@
 import os
 from dataclasses import is_dataclass
+from functools import lru_cache
 from inspect import isclass
 from typing import (
     Any,
@@ -11,6 +12,7 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -40,6 +42,8 @@ def get_args(value, defaults):
 
 KT, VT = get_args(Dict, (TypeVar("KT"), TypeVar("VT")))
 (T,) = get_args(List, (TypeVar("T"),))
+# maximum number of annotations in the identity cache of TypingInfo.get
+TYPING_INFO_CACHE_SIZE = 4096
 
 
 class TypingInfo(NamedTuple):
@@ -47,6 +51,8 @@ class TypingInfo(NamedTuple):
 
     element: ElementType
     container: Optional[type] = None
+    discriminator: Optional[str] = None
+    """name of the tag field of a union of dataclasses"""
 
     @property
     def is_dataclass(self) -> bool:
@@ -68,15 +74,48 @@ class TypingInfo(NamedTuple):
         """True if :attr:`.element` is either a dataclass or a union"""
         return self.element is type(None)  # noqa: E721
 
+    def with_discriminator(self, discriminator: Optional[str]) -> "TypingInfo":
+        """Return a :class:`.TypingInfo` with a discriminator for the union
+        in this typing info or in its container element
+        """
+        if not discriminator:
+            return self
+        elif self.container and isinstance(self.element, TypingInfo):
+            return self._replace(element=self.element.with_discriminator(discriminator))
+        elif self.is_union:
+            return self._replace(discriminator=discriminator)
+        raise InvalidTypeException(
+            f"discriminator {discriminator} requires a union of dataclasses"
+        )
+
     @classmethod
     def get(cls, value: Any) -> Optional["TypingInfo"]:
         """Create a :class:`.TypingInfo` from a typing annotation or
         another typing info
 
+        Resolved annotations are cached, first by identity and then by hash
+        of the annotation and its arguments (so that the order of union members
+        is preserved), annotations which are not hashable are resolved every time.
+
         :param value: typing annotation
         """
         if value is None or isinstance(value, cls):
             return value
+        cached = _typing_info_cache.get(id(value))
+        # the cache holds a reference to the annotation so that its id is not reused
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        try:
+            info = _resolve_typing_info(_typing_key(value), value)
+        except TypeError:
+            return cls._get(value)
+        if len(_typing_info_cache) >= TYPING_INFO_CACHE_SIZE:
+            _typing_info_cache.clear()
+        _typing_info_cache[id(value)] = (value, info)
+        return info
+
+    @classmethod
+    def _get(cls, value: Any) -> "TypingInfo":
         origin = get_origin(value)
         if not origin:
             if value is Any or isclass(value):
@@ -115,6 +154,23 @@ class TypingInfo(NamedTuple):
             )
 
 
+_typing_info_cache: Dict[int, Tuple[Any, TypingInfo]] = {}
+
+
+def _typing_key(value: Any) -> Any:
+    # typing considers unions with the same members in a different order equal,
+    # the key includes the arguments so that member order is preserved
+    args = getattr(value, "__args__", None)
+    if not args:
+        return value
+    return value, tuple(_typing_key(arg) for arg in args)
+
+
+@lru_cache(TYPING_INFO_CACHE_SIZE)
+def _resolve_typing_info(key: Any, value: Any) -> TypingInfo:
+    return TypingInfo._get(value)
+
+
 def get_env() -> str:
     return os.environ.get("PYTHON_ENV") or PRODUCTION
 
@@ -2,10 +2,13 @@ import logging
 from unittest.mock import patch
 
 import click
+import yaml
 from click.testing import CliRunner
 
+from openapi import json
 from openapi.logger import logger
 from openapi.rest import rest
+from tests.example import endpoints
 
 
 def test_usage():
@@ -72,6 +75,42 @@ def test_commands():
     assert result.output.startswith("Hello!")
 
 
+def test_spec_export():
+    runner = CliRunner()
+    cli = rest(
+        openapi={},
+        base_path="/v1",
+        setup_app=lambda app: app.router.add_routes(endpoints.routes),
+    )
+    result = runner.invoke(cli, ["spec", "export"])
+    assert result.exit_code == 0
+    spec = json.loads(result.output)
+    assert spec["servers"] == [{"url": "/v1", "description": "Api server"}]
+    assert "/tasks" in spec["paths"]
+
+
+def test_spec_export_yaml(tmp_path):
+    runner = CliRunner()
+    cli = rest(
+        openapi={}, setup_app=lambda app: app.router.add_routes(endpoints.routes)
+    )
+    output = tmp_path / "spec.yaml"
+    result = runner.invoke(cli, ["spec", "export", "-o", str(output)])
+    assert result.exit_code == 0
+    spec = yaml.safe_load(output.read_text())
+    assert spec["servers"] == [{"url": "/", "description": "Api server"}]
+    assert "/tasks" in spec["paths"]
+    result = runner.invoke(cli, ["spec", "export", "--format", "yaml"])
+    assert yaml.safe_load(result.output) == spec
+
+
+def test_spec_export_no_spec():
+    runner = CliRunner()
+    result = runner.invoke(rest(), ["spec", "export"])
+    assert result.exit_code == 1
+    assert "OpenAPI spec not available" in result.output
+
+
 @click.command("hello")
 @click.pass_context
 def hello(ctx):
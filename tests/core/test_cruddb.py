@@ -1,6 +1,14 @@
 from datetime import datetime
 
-from openapi.db import CrudDB
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from openapi.data.dump import dump, dump_rows
+from openapi.db import CrudDB, dbmodel
+from openapi.db.dbmodel import insert_records, unique_columns, upsert_query
+from tests.example.db.tables1 import TaskType
+from tests.example.models import Task
 
 
 async def test_upsert(db: CrudDB) -> None:
@@ -20,3 +28,163 @@ async def test_upsert_no_data(db: CrudDB) -> None:
     task = await db.db_upsert(db.tasks, dict(title="Example2"))
     assert task.id
     assert task.title == "Example2"
+
+
+async def test_dump_rows(db: CrudDB) -> None:
+    await db.db_insert(
+        db.tasks, [dict(title="Row1", severity=0), dict(title="Row2", severity=2)]
+    )
+    rows = (await db.db_select(db.tasks, dict(title=["Row1", "Row2"]))).all()
+    data = dump_rows(Task, rows)
+    assert len(data) == 2
+    for row, value in zip(rows, data):
+        assert value == dump(Task, row._asdict())
+        assert value == dump(Task, row)
+    assert data[0]["severity"] == 0
+    assert "done" not in data[0]
+    assert dump_rows(Task, []) == []
+
+
+async def test_insert_pages(db: CrudDB, mocker) -> None:
+    mocker.patch.object(dbmodel, "MAX_BIND_PARAMETERS", 5)
+    records = [dict(title=f"Page{i}", severity=i) for i in range(7)]
+    records[3] = dict(title="Page3")
+    result = await db.db_insert(db.tasks, records)
+    rows = result.all()
+    assert [row.title for row in rows] == [f"Page{i}" for i in range(7)]
+    assert rows[3].severity is None
+    result = await db.db_insert(db.tasks, [dict(title="Page7")], returning=False)
+    assert result.returns_rows is False
+    assert await db.db_count(db.tasks) == 8
+
+
+def test_insert_records() -> None:
+    records = [dict(a=1, b=2), dict(b=3, a=4)]
+    assert insert_records(records) is records
+    records = insert_records([dict(a=1), dict(b=2)])
+    assert records == [dict(a=1, b=None), dict(a=None, b=2)]
+
+
+async def test_copy_insert(db: CrudDB) -> None:
+    records = (
+        dict(title=f"Copy{i}", severity=i, type=TaskType.todo if i else None)
+        for i in range(5)
+    )
+    assert await db.db_copy_insert(db.tasks, records) == 5
+    rows = (await db.db_select(db.tasks, {})).all()
+    assert len(rows) == 5
+    assert {row.title for row in rows} == {f"Copy{i}" for i in range(5)}
+    assert all(row.id for row in rows)
+    assert all(row.created_by == "" for row in rows)
+    assert {row.type for row in rows} == {None, TaskType.todo}
+    assert await db.db_copy_insert(db.tasks, []) == 0
+
+
+async def test_copy_insert_rollback(db: CrudDB) -> None:
+    with pytest.raises(RuntimeError):
+        async with db.transaction() as conn:
+            assert await db.db_copy_insert(db.tasks, [dict(title="Copy")], conn=conn)
+            assert await db.db_count(db.tasks, conn=conn) == 1
+            raise RuntimeError
+    assert await db.db_count(db.tasks) == 0
+
+
+async def test_copy_insert_staging(db: CrudDB) -> None:
+    records = [dict(title="Copy1", unique_title="u1")]
+    result = await db.db_copy_insert(db.tasks, records, returning=True)
+    assert [row.title for row in result.all()] == ["Copy1"]
+    records.append(dict(title="Copy2", unique_title="u2"))
+    assert await db.db_copy_insert(db.tasks, records, on_conflict_do_nothing=True) == 1
+    assert await db.db_count(db.tasks) == 2
+
+
+async def test_copy_insert_quoted_names(db: CrudDB) -> None:
+    table = sa.Table(
+        "CopyOrder",
+        sa.MetaData(),
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("select", sa.String),
+    )
+    async with db.ensure_connection() as conn:
+        await conn.run_sync(table.create)
+    try:
+        records = [dict(id=1, select="a"), dict(id=2, select="b")]
+        result = await db.db_copy_insert(table, records, returning=True)
+        assert [row.select for row in result.all()] == ["a", "b"]
+        records.append(dict(id=3, select="c"))
+        assert await db.db_copy_insert(table, records, on_conflict_do_nothing=True) == 1
+    finally:
+        async with db.ensure_connection() as conn:
+            await conn.run_sync(table.drop)
+
+
+def test_unique_columns(db: CrudDB) -> None:
+    assert unique_columns(db.tasks, frozenset(("unique_title",))) == ("unique_title",)
+    assert unique_columns(db.tasks, frozenset(("id", "title"))) == ("id",)
+    assert unique_columns(db.tasks, frozenset(("id", "title")), exact=True) is None
+    assert unique_columns(db.series, frozenset(("date", "group", "value"))) == (
+        "date",
+        "group",
+    )
+
+
+def test_upsert_query_onupdate() -> None:
+    table = sa.Table(
+        "onupdate",
+        sa.MetaData(),
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String),
+        sa.Column("updated", sa.DateTime, onupdate=sa.func.now()),
+        sa.Column("version", sa.String, onupdate=lambda: "v2"),
+    )
+    dialect = postgresql.dialect()
+    sql_query = upsert_query(table, dict(id=1, name="a"), ("id",))
+    compiled = sql_query.compile(dialect=dialect)
+    sql = str(compiled)
+    assert "updated = now()" in sql
+    assert "version = %(param_1)s" in sql
+    assert compiled.params["param_1"] == "v2"
+    sql_query = upsert_query(table, dict(id=1), ("id",))
+    sql = str(sql_query.compile(dialect=dialect))
+    assert "updated" not in sql.split("DO UPDATE")[1].split("RETURNING")[0]
+
+
+async def test_upsert_on_conflict(db: CrudDB) -> None:
+    task = await db.db_upsert(
+        db.tasks, dict(unique_title="u1"), dict(title="First", severity=1)
+    )
+    task2 = await db.db_upsert(db.tasks, dict(unique_title="u1"), dict(severity=2))
+    assert task2.id == task.id
+    assert task2.title == "First"
+    assert task2.severity == 2
+    task3 = await db.db_upsert(db.tasks, dict(id=task.id))
+    assert task3.severity == 2
+    task4 = await db.db_upsert(db.tasks, dict(unique_title="u1"), dict(title="Second"))
+    assert task4.id == task.id
+    assert task4.title == "Second"
+    assert task4.severity == 2
+    assert await db.db_count(db.tasks) == 1
+
+
+async def test_upsert_many(db: CrudDB) -> None:
+    records = [dict(title=f"Task{i}", unique_title=f"u{i}") for i in range(3)]
+    result = await db.db_upsert_many(db.tasks, records)
+    assert len(result.all()) == 3
+    records = [
+        dict(title="Task1 updated", unique_title="u1", severity=1),
+        dict(title="Task3", unique_title="u3"),
+    ]
+    result = await db.db_upsert_many(db.tasks, records)
+    rows = {row.unique_title: row for row in result.all()}
+    assert rows["u1"].title == "Task1 updated"
+    assert rows["u1"].severity == 1
+    assert rows["u3"].severity is None
+    assert await db.db_count(db.tasks) == 4
+    result = await db.db_upsert_many(
+        db.tasks, [dict(unique_title="u1", title="ignored")], update=()
+    )
+    assert result.one().title == "Task1 updated"
+    with pytest.raises(ValueError):
+        await db.db_upsert_many(db.tasks, [dict(title="no unique")])
+    assert (await db.db_upsert_many(db.tasks, [])).all() == []
+    assert await db.db_count(db.tasks) == 4
@@ -126,6 +126,49 @@ async def test_create_list(cli):
     assert "bar" in titles
 
 
+async def test_create_list_errors(cli):
+    tasks = [dict(title="foo"), dict(), dict(title="bar", severity="x")]
+    response = await cli.post("/bulk/tasks", json=tasks)
+    data = await json_body(response, status=422)
+    assert data["errors"] == [
+        dict(field=1, message=dict(title="required")),
+        dict(field=2, message=dict(severity="x not valid number")),
+    ]
+    response = await cli.get("/tasks")
+    assert await json_body(response) == []
+
+
+async def test_create_stream(cli):
+    tasks = [dict(title="aaa"), dict(), dict(title="bbb"), dict(title="ccc"), dict()]
+    body = "\n".join(dumps(task) for task in tasks)
+    response = await cli.post(
+        "/stream/tasks", data=body, headers={"content-type": "application/x-ndjson"}
+    )
+    data = await json_body(response, status=201)
+    assert data == dict(
+        accepted=3,
+        rejected=2,
+        errors=[dict(field=1, message=dict(title="required"))],
+    )
+    response = await cli.get("/tasks")
+    assert {task["title"] for task in await json_body(response)} == {
+        "aaa",
+        "bbb",
+        "ccc",
+    }
+
+
+async def test_create_stream_unique(cli):
+    tasks = [
+        dict(title="aaa", unique_title="xxx"),
+        dict(title="bbb", unique_title="xxx"),
+    ]
+    response = await cli.post("/stream/tasks", data=dumps(tasks))
+    await json_body(response, status=422)
+    response = await cli.get("/tasks")
+    assert await json_body(response) == []
+
+
 async def test_get_ordered_list(cli):
     tasks = [
         dict(title="ccc"),
@@ -1,10 +1,12 @@
 import enum
 from datetime import datetime
+from decimal import Decimal
 from uuid import uuid4
 
 import pytest
 
-from openapi.json import encoder
+from openapi import json
+from openapi.json import JsonArrayDecoder, JSONDecodeError, encoder
 
 
 class Pippo(enum.Enum):
@@ -35,3 +37,120 @@ def test_encoder_invalid_type():
         encoder(123)
     with pytest.raises(TypeError):
         encoder([1, 2, 3])
+
+
+@pytest.fixture(params=["simplejson", "json"])
+def backend(request):
+    original = json.get_backend()
+    try:
+        yield json.set_backend(request.param)
+    except ValueError:
+        pytest.skip(f"{request.param} not available")
+    finally:
+        json.set_backend(original)
+
+
+def test_backend(backend):
+    assert json.get_backend() is backend
+    assert str(backend) == backend.name
+    now = datetime.now()
+    data = json.loads(
+        json.dumps(dict(a=Decimal("1.5"), b=now, c=(1, 2), d={"x"}, e=None))
+    )
+    assert data == dict(a=Decimal("1.5"), b=now.isoformat(), c=[1, 2], d=["x"], e=None)
+    assert type(data["a"]) is Decimal
+    assert json.loads(json.dumps(dict(a=1), indent=4)) == dict(a=1)
+    assert json.loads(json.dumps_bytes([now])) == [now.isoformat()]
+
+
+def test_backend_semantics(backend):
+    uuid = uuid4()
+    exact = Decimal("0.1000000000000000000001")
+    data = dict(u=uuid, e=Pippo.foo, d=exact, n=[{uuid}], k={"x": Pippo.bla})
+    for encoded in (json.dumps(data), json.dumps_bytes(data)):
+        decoded = json.loads(encoded)
+        assert decoded == dict(
+            u=uuid.hex, e="foo", d=exact, n=[[uuid.hex]], k={"x": "bla"}
+        )
+        assert type(decoded["d"]) is Decimal
+    assert type(json.loads("0.1")) is Decimal
+    assert type(json.loads(b"[0.1]")[0]) is Decimal
+
+
+def test_backend_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads("{bla")
+
+
+def test_backend_encode_error(backend):
+    with pytest.raises(TypeError):
+        json.dumps(dict(a=object()))
+
+
+def test_backend_not_available():
+    with pytest.raises(ValueError):
+        json.set_backend("bla")
+    with pytest.raises(ValueError):
+        json.set_backend("orjson")
+    assert json.get_backend().name == json.JSON_BACKEND
+
+
+def test_register_backend():
+    class UpperBackend(json.SimpleJsonBackend):
+        name = "upper"
+
+        def dumps(self, data, **kwargs):
+            return super().dumps(data, **kwargs).upper()
+
+    original = json.get_backend()
+    json.register_backend(UpperBackend)
+    try:
+        json.set_backend("upper")
+        assert json.dumps(dict(a="b")) == '{"A": "B"}'
+    finally:
+        json.set_backend(original)
+        json.BACKENDS.pop("upper")
+
+
+def test_json_array_decoder():
+    data = '[ {"a": 1.5, "b": [1, 2]}, 12345 , "x\\"y", "é", true, null]'.encode()
+    decoder = JsonArrayDecoder()
+    items = []
+    for i in range(len(data)):
+        items.extend(decoder.feed(data[i : i + 1]))
+    items.extend(decoder.feed(b"", final=True))
+    assert items == [dict(a=Decimal("1.5"), b=[1, 2]), 12345, 'x"y', "é", True, None]
+    assert JsonArrayDecoder().feed(b" [ ] ", final=True) == []
+
+
+@pytest.mark.parametrize(
+    "chunks,expected",
+    [
+        ((b"[1.", b"5]"), [Decimal("1.5")]),
+        ((b"[12e", b"3]"), [12e3]),
+        ((b"[12E", b"+3, 4]"), [12e3, 4]),
+        ((b"[1", b"2, -", b"3.25", b"]"), [12, Decimal("-3.25")]),
+    ],
+)
+def test_json_array_decoder_split_number(chunks, expected):
+    decoder = JsonArrayDecoder()
+    items = []
+    for chunk in chunks[:-1]:
+        items.extend(decoder.feed(chunk))
+    items.extend(decoder.feed(chunks[-1], final=True))
+    assert items == expected
+
+
+@pytest.mark.parametrize("data", [b"{}", b"[1,]", b"[1 2]", b"[1", b"[1] 2"])
+def test_json_array_decoder_invalid(data):
+    with pytest.raises(JSONDecodeError):
+        JsonArrayDecoder().feed(data, final=True)
+
+
+def test_json_array_decoder_max_item_size():
+    decoder = JsonArrayDecoder(max_item_size=10)
+    assert decoder.feed(b'["abc", "de') == ["abc"]
+    with pytest.raises(JSONDecodeError):
+        decoder.feed(b"fghijklm")
+    decoder = JsonArrayDecoder(max_item_size=10)
+    assert decoder.feed(b'["abcdefgh", 1]', final=True) == ["abcdefgh", 1]
@@ -1,6 +1,114 @@
-from openapi.testing import json_body
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List
+
+from aiohttp import web
+
+from openapi.data import fields
+from openapi.json import dumps, loads
+from openapi.rest import rest
+from openapi.spec import op
+from openapi.spec.path import ApiPath, StreamErrors, json_response
+from openapi.testing import app_cli, json_body
+
+stream_routes = web.RouteTableDef()
+
+
+@dataclass
+class Item:
+    name: str = fields.str_field(required=True, description="item name")
+    value: Decimal = fields.decimal_field(description="item value")
+
+
+@stream_routes.view("/stream")
+class StreamPath(ApiPath):
+    @op(body_schema=List[Item])
+    async def post(self):
+        items = [
+            item async for item in self.json_stream(chunk_size=7, max_item_size=60)
+        ]
+        return self.json_response(items)
+
+
+async def stream_cli():
+    cli = rest(setup_app=lambda app: app.router.add_routes(stream_routes))
+    return app_cli(cli.web())
 
 
 async def test_servers(cli):
     response = await cli.get("/")
     await json_body(response)
+
+
+async def test_json_response(cli):
+    response = await cli.get("/tasks")
+    data = await json_body(response)
+    assert data == []
+    assert response.headers["content-type"] == "application/json; charset=utf-8"
+    assert response.headers["content-length"] == "2"
+    assert response.headers["x-total-count"] == "0"
+
+
+def test_json_response_bytes():
+    response = json_response(dict(a=Decimal("1.5")), status=201)
+    assert response.status == 201
+    assert isinstance(response.body, bytes)
+    assert loads(response.body) == dict(a=Decimal("1.5"))
+    assert response.content_type == "application/json"
+    assert response.charset == "utf-8"
+    response = json_response([1], dumps=lambda d: "[1]")
+    assert response.body == b"[1]"
+
+
+async def test_json_stream():
+    items = [dict(name="a", value=Decimal("1.5")), dict(name="bé"), dict(name="c")]
+    async with await stream_cli() as cli:
+        response = await cli.post("/stream", data=dumps(items))
+        assert await json_body(response) == items
+        response = await cli.post("/stream", data="[]")
+        assert await json_body(response) == []
+        response = await cli.post("/stream", data=dumps([dict(name="a"), dict()]))
+        data = await json_body(response, 422)
+        assert data["errors"] == [dict(field=1, message=dict(name="required"))]
+        response = await cli.post("/stream", data='[{"name": "a"},')
+        await json_body(response, 400)
+        response = await cli.post("/stream", data=b'[{"name": "\xff"}]')
+        await json_body(response, 400)
+
+
+def test_stream_errors():
+    errors = StreamErrors(2)
+    for index in range(5):
+        errors[index] = dict(name="required")
+    assert errors.count == 5
+    assert errors == {0: dict(name="required"), 1: dict(name="required")}
+
+
+async def test_json_stream_ndjson():
+    items = [dict(name="a" * 20, value=Decimal("1.5")), dict(name="b")]
+    body = "\n".join(dumps(item) for item in items) + "\n\n"
+    headers = {"content-type": "application/x-ndjson"}
+    async with await stream_cli() as cli:
+        response = await cli.post("/stream", data=body, headers=headers)
+        assert await json_body(response) == items
+        response = await cli.post("/stream", data="{]\n", headers=headers)
+        await json_body(response, 400)
+        response = await cli.post(
+            "/stream", data=b'{"name": "\xff"}\n', headers=headers
+        )
+        await json_body(response, 400)
+
+
+async def test_json_stream_max_item_size():
+    headers = {"content-type": "application/x-ndjson"}
+    async with await stream_cli() as cli:
+        response = await cli.post("/stream", data=dumps([dict(name="a" * 80)]))
+        await json_body(response, 400)
+        response = await cli.post(
+            "/stream", data=dumps(dict(name="a" * 80)) + "\n", headers=headers
+        )
+        await json_body(response, 400)
+        response = await cli.post(
+            "/stream", data=dumps(dict(name="a" * 80)), headers=headers
+        )
+        await json_body(response, 400)
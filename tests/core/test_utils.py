@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
 import pytest
 
@@ -57,6 +57,32 @@ def test_typing_info() -> None:
     assert TypingInfo.get(info) is info
 
 
+def test_typing_info_cache() -> None:
+    info = TypingInfo.get(List[Dict[str, int]])
+    assert TypingInfo.get(List[Dict[str, int]]) is info
+    assert TypingInfo.get(list) is TypingInfo.get(list)
+
+
+def test_typing_info_union_order() -> None:
+    assert TypingInfo.get(Union[int, str]).element == (
+        TypingInfo(int),
+        TypingInfo(str),
+    )
+    assert TypingInfo.get(Union[str, int]).element == (
+        TypingInfo(str),
+        TypingInfo(int),
+    )
+
+
+def test_typing_info_unhashable() -> None:
+    class Annotation:
+        __origin__ = list
+        __args__ = (int,)
+        __hash__ = None
+
+    assert TypingInfo.get(Annotation()) == utils.TypingInfo(int, list)
+
+
 def test_typing_info_dict_list() -> None:
     assert TypingInfo.get(Dict) == utils.TypingInfo(Any, dict)
     assert TypingInfo.get(List) == utils.TypingInfo(Any, list)
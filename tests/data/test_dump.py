@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Optional
+
+from openapi.data import fields
+from openapi.data.dump import dump, dump_plan, type_dumper
+from openapi.utils import TypingInfo
+from tests.example.models import Foo, SourcePrice
+
+
+@dataclass
+class Node:
+    name: str = fields.str_field(dump=lambda v: v.upper())
+    children: List["Node"] = fields.data_field(default_factory=list)
+    parent: Optional[str] = None
+
+
+Node.__dataclass_fields__["children"].type = List[Node]
+
+
+def test_dump_plan():
+    plan = dump_plan(SourcePrice)
+    assert dump_plan(SourcePrice) is plan
+    assert plan["id"] is not None
+    assert plan["extra"] is dict
+    assert plan["foos"] is not None
+    assert type_dumper(TypingInfo.get(int)) is None
+
+
+def test_dump_nested():
+    data = dict(
+        id=1,
+        extra=None,
+        prices=dict(foo=Decimal("4.5")),
+        foos=[Foo(text="a", param=1), dict(text="b", param="x", done=True)],
+        other="not in schema",
+    )
+    assert dump(SourcePrice, data) == dict(
+        id=1,
+        prices=dict(foo=Decimal("4.5")),
+        foos=[
+            dict(text="a", param=1, done=False),
+            dict(text="b", param="x", done=True),
+        ],
+    )
+
+
+def test_dump_recursive():
+    node = Node(name="root", children=[Node(name="leaf", parent="root")])
+    assert dump(Node, node) == dict(
+        name="ROOT", children=[dict(name="LEAF", parent="root")]
+    )
+    assert dump(List[Node], [node])[0]["name"] == "ROOT"
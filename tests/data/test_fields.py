@@ -1,15 +1,17 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from uuid import uuid4
 
 import pytest
 
+from openapi import tz
 from openapi.data.fields import (
     VALIDATOR,
     BoolValidator,
     Choice,
     DateTimeValidator,
+    DateValidator,
     DecimalValidator,
     IntegerValidator,
     ListValidator,
@@ -20,6 +22,7 @@ from openapi.data.fields import (
     as_field,
     bool_field,
     data_field,
+    date_field,
     date_time_field,
     decimal_field,
     email_field,
@@ -147,6 +150,35 @@ def test_DateTimeValidator_call_invalid():
         validator(field, "invalid_date")
 
 
+def test_DateTimeValidator_iso_utc():
+    field = date_time_field()
+    validator = DateTimeValidator()
+    expected = datetime(2020, 1, 2, 10, 30, tzinfo=tz.UTC)
+    assert validator(field, "2020-01-02T10:30:00Z") == expected
+    assert validator(field, "2020-01-02T10:30:00+00:00") == expected
+    with pytest.raises(ValidationError):
+        validator(field, "2020-01-02T10:30:00+05:00Z")
+    with pytest.raises(ValueError):
+        tz.parse_datetime("2020-01-02T10:30:00+05:00Z", loose=True)
+
+
+def test_DateTimeValidator_loose():
+    field = date_time_field()
+    assert DateTimeValidator()(field, "2 Jan 2020") == datetime(2020, 1, 2)
+    with pytest.raises(ValidationError):
+        DateTimeValidator(loose=False)(field, "2 Jan 2020")
+
+
+def test_DateValidator():
+    field = date_field()
+    validator = DateValidator()
+    assert validator(field, "2020-01-02") == date(2020, 1, 2)
+    assert validator(field, "2020-01-02T10:30:00Z") == date(2020, 1, 2)
+    assert validator(field, "2 Jan 2020") == date(2020, 1, 2)
+    with pytest.raises(ValidationError):
+        DateValidator(loose=False)(field, "2 Jan 2020")
+
+
 def test_DateTimeValidator_dump():
     value = datetime.now()
     validator = DateTimeValidator()
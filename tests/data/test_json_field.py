@@ -1,4 +1,5 @@
 from dataclasses import dataclass, fields
+from decimal import Decimal
 from typing import Dict, List
 
 import pytest
@@ -38,3 +39,29 @@ def test_json_field_error():
     validator = field.metadata[VALIDATOR]
     with pytest.raises(ValidationError):
         validator(field, object())
+
+
+def test_json_field_no_copy():
+    field = json_field()
+    validator = field.metadata[VALIDATOR]
+    value = dict(a=[1, 2, dict(b=Decimal("1.5"))], c=None)
+    assert validator(field, value) is value
+    assert validator(field, '{"a": [1]}') == dict(a=[1])
+    with pytest.raises(ValidationError):
+        validator(field, dict(a=[object()]))
+    with pytest.raises(ValidationError):
+        validator(field, {(1, 2): 3})
+    with pytest.raises(ValidationError):
+        validator(field, (1, object()))
+
+
+def test_json_field_limits():
+    field = json_field(max_depth=2, max_size=5)
+    validator = field.metadata[VALIDATOR]
+    assert validator(field, dict(a=[1, 2])) == dict(a=[1, 2])
+    with pytest.raises(ValidationError) as exc:
+        validator(field, dict(a=[[1]]))
+    assert exc.value.message == "JSON document too deep"
+    with pytest.raises(ValidationError) as exc:
+        validator(field, [1, 2, 3, 4, 5])
+    assert exc.value.message == "JSON document too large"
@@ -2,11 +2,34 @@ from dataclasses import asdict, dataclass
 from typing import Dict, List, Union
 
 import pytest
+from multidict import MultiDict
 
 from openapi import json
 from openapi.data import fields
-from openapi.data.validate import ValidationErrors, validate, validated_schema
-from tests.example.models import Foo, Moon, Permission, Role, TaskAdd
+from openapi.data.validate import (
+    NOT_VALID_TYPE,
+    OBJECT_EXPECTED,
+    ValidatingDict,
+    ValidatingList,
+    ValidationErrors,
+    as_mapping,
+    validate,
+    validate_many,
+    validated_schema,
+    validation_plan,
+)
+from openapi.exc import InvalidTypeException
+from tests.example.models import (
+    ClickEvent,
+    Events,
+    Foo,
+    Moon,
+    Permission,
+    Role,
+    SourcePrice,
+    TaskAdd,
+    TaskQuery,
+)
 
 
 @dataclass
@@ -44,6 +67,22 @@ def test_validated_schema_errors():
     assert repr(e.value) == json.dumps(e.value.errors, indent=4)
 
 
+def test_validate_many():
+    records = [dict(title="abc"), dict(severity=1), dict(title="cde", severity="x")]
+    validated = validate_many(TaskAdd, records)
+    assert validated.errors == {
+        1: {"title": "required"},
+        2: {"severity": "x not valid number"},
+    }
+    assert validated.data[0]["title"] == "abc"
+    assert validated.data[1:] == [None, None]
+    validated = validate_many(TaskAdd, records[:1], as_schema=True)
+    assert validated.errors == {}
+    assert validated.data[0].title == "abc"
+    assert validate_many(int, [1, "x"]).errors == {1: NOT_VALID_TYPE}
+    assert validate_many(TaskAdd, dict(title="a")).errors == "expected a sequence"
+
+
 def test_openapi_listvalidator():
     validator = fields.ListValidator([fields.NumberValidator(-1, 1)])
     props = {}
@@ -124,3 +163,101 @@ def test_float_validation():
     assert s.value == 24500
     s = validated_schema(Foo2, dict(value=24500.5))
     assert s.value == 24500.5
+
+
+def test_validation_plan():
+    plan = validation_plan(TaskQuery)
+    assert validation_plan(TaskQuery) is plan
+    assert plan.schema is TaskQuery
+    fields_ = {f.name: f for f in plan.fields}
+    assert fields_["severity"].ops == (
+        "severity",
+        "severity:lt",
+        "severity:le",
+        "severity:gt",
+        "severity:ge",
+        "severity:ne",
+    )
+    assert fields_["limit"].default() == 50
+    assert fields_["severity"].collect("3") == 3
+    assert fields_["severity"].collect("NULL") is None
+
+
+def test_validate_does_not_copy_input():
+    data = dict(id=1)
+    assert validate(SourcePrice, data).data == dict(id=1, prices={}, foos=[])
+    assert data == dict(id=1)
+    query = MultiDict([("title", "abc"), ("severity", "1")])
+    assert as_mapping(query, multiple=True) is query
+    assert as_mapping(data) is data
+    assert as_mapping([("id", 1)]) == dict(id=1)
+    with pytest.raises(ValidationErrors):
+        as_mapping(1)
+
+
+def test_validation_plan_default_factory():
+    plan = validation_plan(SourcePrice)
+    prices = {f.name: f for f in plan.fields}["prices"]
+    assert prices.default() == {}
+    assert prices.default() is not prices.default()
+
+
+def test_discriminated_union():
+    data = dict(
+        event=dict(type="view", page="home"),
+        events=[dict(type="click", x=3), dict(type="view", page="about")],
+    )
+    events = validated_schema(Events, data)
+    assert events.event.page == "home"
+    assert isinstance(events.events[0], ClickEvent)
+    assert events.events[0].x == 3
+    assert events.events[1].page == "about"
+
+
+def test_discriminated_union_errors():
+    errors = validate(Events, dict(event=dict(type="scroll"))).errors
+    assert errors == dict(event=dict(type="scroll not a valid choice"))
+    errors = validate(Events, dict(event=dict(type="click"))).errors
+    assert errors == dict(event=dict(x="required"))
+    errors = validate(Events, dict(event=dict(type="click", x=1), events=[1])).errors
+    assert errors == dict(events=OBJECT_EXPECTED)
+
+
+def test_discriminator_invalid():
+    @dataclass
+    class Invalid:
+        value: Union[int, str] = fields.data_field(discriminator="type")
+
+    with pytest.raises(InvalidTypeException):
+        validate(Invalid, dict(value=1))
+
+
+def test_lazy_list():
+    data = [dict(title="abc"), dict(severity=1), dict(title="cde", severity="x")]
+    view = validate(List[TaskAdd], data, lazy=True).data
+    assert isinstance(view, ValidatingList)
+    assert len(view) == 3
+    assert view.errors == {}
+    assert view[0]["title"] == "abc"
+    assert view[:1] == [view[0]]
+    assert [d["title"] for d in view] == ["abc"]
+    assert view.errors == {
+        1: {"title": "required"},
+        2: {"severity": "x not valid number"},
+    }
+    with pytest.raises(ValidationErrors) as exc:
+        view[1]
+    assert exc.value.errors == {1: {"title": "required"}}
+    assert validate(List[int], dict(a=1), lazy=True).errors == "expected a sequence"
+
+
+def test_lazy_dict():
+    view = validate(Dict[str, int], dict(a=1, b="x", c=3), lazy=True).data
+    assert isinstance(view, ValidatingDict)
+    assert list(view) == ["a", "b", "c"]
+    assert dict(view.items()) == dict(a=1, c=3)
+    assert list(view.values()) == [1, 3]
+    assert view.errors == dict(b=NOT_VALID_TYPE)
+    assert view["a"] == 1
+    validated = validate(Dict[str, int], [], lazy=True)
+    assert validated.errors == OBJECT_EXPECTED
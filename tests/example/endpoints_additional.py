@@ -52,6 +52,31 @@ class TaskBulkPath(SqlApiPath):
         return self.json_response(data, status=201)
 
 
+@additional_routes.view("/stream/tasks")
+class TaskStreamPath(SqlApiPath):
+    """
+    ---
+    summary: Stream tasks
+    tags:
+        - Task
+    """
+
+    table = "tasks"
+
+    @op(body_schema=List[TaskAdd])
+    async def post(self):
+        """
+        ---
+        summary: Create Tasks
+        description: Create Tasks from a JSON array or NDJSON stream
+        responses:
+            201:
+                description: Number of accepted and rejected tasks
+        """
+        data = await self.create_stream(batch_size=2, max_errors=1)
+        return self.json_response(data, status=201)
+
+
 @additional_routes.view("/transaction/tasks")
 class TaskTransactionsPath(SqlApiPath):
     """
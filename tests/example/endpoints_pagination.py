@@ -30,7 +30,7 @@ BaseQuery = dataclass_from_table(
 @dataclass
 class SeriesQueryCursor(
     BaseQuery,
-    cursorPagination("-date"),
+    cursorPagination("-date", table=DB.series, tiebreaker="group"),
 ):
     """Series query with cursor pagination"""
 
@@ -38,7 +38,7 @@ class SeriesQueryCursor(
 @dataclass
 class SeriesQueryOffset(
     BaseQuery,
-    offsetPagination("-date", "date"),
+    offsetPagination("-date", "date", count_mode="window"),
 ):
     """Series query with offset pagination"""
 
@@ -124,3 +124,31 @@ class SourcePrice:
 @dataclass
 class BundleUpload:
     files: List[bytes] = fields.data_field(description="list of bundles to upload")
+
+
+@dataclass
+class ClickEvent:
+    """A click event"""
+
+    type: str = fields.str_field(default="click", description="event type")
+    x: int = fields.integer_field(required=True, description="x coordinate")
+
+
+@dataclass
+class ViewEvent:
+    """A page view event"""
+
+    type: str = fields.str_field(default="view", description="event type")
+    page: str = fields.str_field(required=True, description="page viewed")
+
+
+@dataclass
+class Events:
+    """A batch of events"""
+
+    event: Union[ClickEvent, ViewEvent] = fields.data_field(
+        required=True, discriminator="type", description="main event"
+    )
+    events: List[Union[ClickEvent, ViewEvent]] = fields.data_field(
+        discriminator="type", default_factory=list, description="other events"
+    )
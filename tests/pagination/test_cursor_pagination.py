@@ -1,7 +1,14 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
 import pytest
+from yarl import URL
 
+from openapi.data.validate import ValidationErrors
+from openapi.db.dbmodel import CrudDB, DbPaginationVisitor
 from openapi.pagination import cursorPagination
-from openapi.pagination.cursor import encode_cursor
+from openapi.pagination.cursor import decode_cursor, encode_cursor
 from openapi.testing import json_body
 
 from .utils import direction_asc, direction_desc
@@ -26,6 +33,132 @@ async def test_bad_cursor(cli2):
     assert await json_body(response, 422) == dict(message="invalid cursor")
 
 
+def test_cursor_encoding():
+    values = (
+        -3,
+        2**70,
+        Decimal("-12.3450"),
+        Decimal("12345678901234567890123456789.12"),
+        Decimal("-1E+30"),
+        UUID("b1a2e1c0-8b3f-4d5a-9c1e-2f3a4b5c6d7e"),
+        datetime(2023, 5, 4, 12, 30, 1, 123, tzinfo=timezone.utc),
+        datetime(1960, 1, 1),
+        date(2020, 2, 29),
+        "héllo",
+        None,
+        True,
+        1.5,
+    )
+    names = tuple(f"f{i}" for i in range(len(values)))
+    cursor = encode_cursor(values, previous=True)
+    assert "=" not in cursor
+    assert "+" not in cursor and "/" not in cursor
+    decoded, previous = decode_cursor(cursor, names)
+    assert previous is True
+    assert decoded == tuple(zip(names, values))
+    assert str(decoded[2][1]) == "-12.3450"
+    assert len(encode_cursor((12345,))) == 7
+
+
+def test_cursor_signature():
+    cursor = encode_cursor((1, "a"), secret="secret")
+    assert decode_cursor(cursor, ("a", "b"), secret="secret") == (
+        (("a", 1), ("b", "a")),
+        False,
+    )
+    with pytest.raises(ValidationErrors):
+        decode_cursor(cursor, ("a", "b"), secret="other")
+    with pytest.raises(ValidationErrors):
+        decode_cursor(encode_cursor((1, "a")), ("a", "b"), secret="secret")
+    tampered = encode_cursor((2, "a"), secret="other")
+    with pytest.raises(ValidationErrors):
+        decode_cursor(tampered, ("a", "b"), secret="secret")
+
+
+def test_cursor_table_types(db: CrudDB):
+    Pagination = cursorPagination("-done", tiebreaker="id", table=db.tasks)
+    id_ = uuid4()
+    done = datetime(2023, 5, 4, tzinfo=timezone.utc)
+    pagination = Pagination(_cursor=encode_cursor(("2023-05-04T00:00:00Z", id_.hex)))
+    cursor, order_by, _ = pagination.cursor_info
+    assert order_by == ("-done", "-id")
+    assert cursor == (("-done", done), ("-id", id_))
+    with pytest.raises(ValidationErrors):
+        Pagination(_cursor=encode_cursor(("bad", id_))).cursor_info
+
+
 def test_cursor_pagination_error():
     with pytest.raises(ValueError):
         cursorPagination()
+    with pytest.warns(UserWarning):
+        Pagination = cursorPagination("-date")
+    assert Pagination().cursor_info[1] == ("-date",)
+
+
+def test_cursor_pagination_table_tiebreaker(db: CrudDB):
+    Pagination = cursorPagination("-date", table=db.series)
+    assert Pagination().cursor_info[1] == ("-date", "-group")
+    Pagination = cursorPagination("group", "-date", table=db.series)
+    assert Pagination().cursor_info[1] == ("group", "-date")
+    Pagination = cursorPagination("title", table=db.tasks)
+    assert Pagination().cursor_info[1] == ("title", "id")
+    Pagination = cursorPagination("-title", table=db.tasks, tiebreaker="unique_title")
+    assert Pagination().cursor_info[1] == ("-title", "-unique_title")
+
+
+async def traverse_db(db: CrudDB, Pagination: type, sql_query, limit: int):
+    pages = []
+    links = []
+    cursor = ""
+    while True:
+        pagination = Pagination(limit=limit, _cursor=cursor)
+        values, _ = await db.db_paginate(db.tasks, sql_query, pagination)
+        data = [dict(row._mapping) for row in values.all()]
+        pages.append(pagination.get_data(data))
+        links.append(pagination.links(URL("/tasks"), data))
+        if "next" not in links[-1]:
+            return pages, links
+        cursor = links[-1]["next"].query["_cursor"]
+
+
+@pytest.mark.parametrize(
+    "order_by,key",
+    [
+        (("severity",), lambda d: (d["severity"], d["unique_title"])),
+        (("-severity",), lambda d: (-d["severity"], [-ord(c) for c in d["title"]])),
+        (("-severity", "title"), lambda d: (-d["severity"], d["title"])),
+    ],
+)
+async def test_keyset_pagination(db: CrudDB, order_by, key):
+    records = [
+        dict(title=f"task{i:02d}", unique_title=f"u{i:02d}", severity=i % 3)
+        for i in range(11)
+    ]
+    await db.db_insert(db.tasks, records)
+    Pagination = cursorPagination(*order_by, tiebreaker="unique_title")
+    sql_query = db.tasks.select()
+    pages, links = await traverse_db(db, Pagination, sql_query, 3)
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    titles = [d["title"] for page in pages for d in page]
+    assert titles == [d["title"] for d in sorted(records, key=key)]
+    # walk back with the prev links
+    cursor = links[-1]["prev"].query["_cursor"]
+    for page in reversed(pages[:-1]):
+        pagination = Pagination(limit=3, _cursor=cursor)
+        values, _ = await db.db_paginate(db.tasks, sql_query, pagination)
+        data = [dict(row._mapping) for row in values.all()]
+        assert pagination.get_data(data) == page
+        prev = pagination.links(URL("/tasks"), data).get("prev")
+        cursor = prev.query["_cursor"] if prev else None
+    assert cursor is None
+
+
+def test_keyset_filter(db: CrudDB):
+    visitor = DbPaginationVisitor(db=db, table=db.tasks, sql_query=db.tasks.select())
+    sql = str(visitor.keyset_filter(("severity", "title"), (1, "a")))
+    assert sql == "(tasks.severity, tasks.title) > (:param_1, :param_2)"
+    sql = str(visitor.keyset_filter(("-severity", "title"), (1, "a")))
+    assert sql == (
+        "tasks.severity < :param_1 OR tasks.severity = :param_1 "
+        "AND tasks.title > :param_2"
+    )
@@ -3,7 +3,9 @@ from typing import Dict
 import pytest
 from yarl import URL
 
+from openapi.db import CrudDB
 from openapi.pagination import offsetPagination
+from openapi.pagination.pagination import COUNT_MODES, COUNT_WINDOW
 from openapi.testing import json_body
 
 from .utils import direction_asc, direction_desc
@@ -53,6 +55,8 @@ async def test_pagination_next_link(cli):
     response = await cli.get("/tasks")
     data = await json_body(response)
     assert "Link" not in response.headers
+    assert response.headers["X-Total-Count"] == "2"
+    assert response.headers["X-Total-Count-Exact"] == "true"
     assert len(data) == 2
 
 
@@ -137,3 +141,89 @@ async def test_direction_desc(cli2, series):
 def test_cursor_pagination_error():
     with pytest.raises(ValueError):
         offsetPagination()
+
+
+@pytest.mark.parametrize("count_mode", COUNT_MODES)
+async def test_count_modes(db: CrudDB, count_mode: str):
+    await db.db_insert(db.tasks, [dict(title=f"task{i:02d}") for i in range(12)])
+    Pagination = offsetPagination("title", count_mode=count_mode)
+    sql_query = db.tasks.select()
+    values, total = await db.db_paginate(
+        db.tasks, sql_query, Pagination(limit=5, offset=10)
+    )
+    rows = values.all()
+    assert total == 12
+    assert [row.title for row in rows] == ["task10", "task11"]
+    assert rows[0]._fields == tuple(db.tasks.columns.keys())
+    values, total = await db.db_paginate(
+        db.tasks, sql_query, Pagination(limit=5, offset=20)
+    )
+    assert values.all() == []
+    assert total == 12
+    values, total = await db.db_paginate(
+        db.tasks, sql_query.where(db.tasks.c.title == "none"), Pagination()
+    )
+    assert values.all() == []
+    assert total == 0
+
+
+def test_invalid_count_mode():
+    with pytest.raises(ValueError):
+        offsetPagination("id", count_mode="bla")
+
+
+async def test_total_capped(db: CrudDB):
+    await db.db_insert(db.tasks, [dict(title=f"task{i:02d}") for i in range(12)])
+    Pagination = offsetPagination("title", total_strategy="capped", total_cap=10)
+    sql_query = db.tasks.select()
+    pagination = Pagination(limit=5)
+    values, total = await db.db_paginate(db.tasks, sql_query, pagination)
+    assert len(values.all()) == 5
+    assert total == 10
+    assert pagination.total_is_exact(total) is False
+    values, total = await db.db_paginate(
+        db.tasks, sql_query.where(db.tasks.c.title < "task03"), pagination
+    )
+    assert total == 3
+    assert pagination.total_is_exact(total) is True
+
+
+async def test_total_estimate(db: CrudDB):
+    await db.db_insert(db.tasks, [dict(title=f"task{i:02d}") for i in range(12)])
+    Pagination = offsetPagination("title", total_strategy="estimate")
+    pagination = Pagination(limit=5)
+    for sql_query in (
+        db.tasks.select(),
+        db.tasks.select().where(db.tasks.c.title < "task03"),
+    ):
+        values, total = await db.db_paginate(db.tasks, sql_query, pagination)
+        assert len(values.all()) <= 5
+        assert isinstance(total, int)
+        assert total >= 0
+        assert pagination.total_is_exact(total) is False
+
+
+async def test_total_cache(db: CrudDB):
+    await db.db_insert(db.tasks, [dict(title=f"task{i:02d}") for i in range(12)])
+    Pagination = offsetPagination("title", total_cache_ttl=60)
+    pagination = Pagination(limit=5)
+    sql_query = db.tasks.select().where(db.tasks.c.title >= "task00")
+    _, total = await db.db_paginate(db.tasks, sql_query, pagination)
+    assert total == 12
+    assert pagination.total_is_exact(total) is False
+    await db.db_insert(db.tasks, dict(title="task12"))
+    _, total = await db.db_paginate(db.tasks, sql_query, pagination)
+    assert total == 12
+    # different parameters are a different cache entry
+    sql_query = db.tasks.select().where(db.tasks.c.title >= "task01")
+    _, total = await db.db_paginate(db.tasks, sql_query, pagination)
+    assert total == 12
+
+
+def test_invalid_total_strategy():
+    with pytest.raises(ValueError):
+        offsetPagination("id", total_strategy="bla")
+    with pytest.raises(ValueError):
+        offsetPagination("id", total_strategy="capped", total_cap=0)
+    with pytest.raises(ValueError):
+        offsetPagination("id", count_mode=COUNT_WINDOW, total_strategy="estimate")
@@ -14,6 +14,8 @@ from openapi.data.fields import (
 )
 from openapi.exc import InvalidSpecException, InvalidTypeException
 from openapi.spec import SchemaParser
+from openapi.spec.spec import SCHEMA_CACHE
+from tests.example.models import Events
 
 
 @pytest.fixture
@@ -220,3 +222,51 @@ def test_non_string_keys():
     parser = SchemaParser()
     with pytest.raises(InvalidTypeException):
         parser.schema2json(MyClass)
+
+
+@dataclass
+class NoDescription:
+    str_field: str = data_field()
+
+
+def test_schema_cache():
+    @dataclass
+    class CachedChild:
+        str_field: str = data_field(description="String field")
+
+    @dataclass
+    class CachedClass:
+        child: CachedChild = data_field(description="Child")
+
+    parser = SchemaParser()
+    schema = parser.dataclass2json(CachedClass)
+    assert (SchemaParser, CachedClass, False) in SCHEMA_CACHE
+    assert list(parser.schemas_to_parse) == ["CachedChild"]
+    schema["properties"].pop("child")
+    parser = SchemaParser()
+    assert parser.dataclass2json(CachedClass)["properties"]["child"] == {
+        "$ref": "#/components/schemas/CachedChild",
+        "description": "Child",
+    }
+    assert list(parser.schemas_to_parse) == ["CachedChild"]
+    with pytest.raises(InvalidSpecException):
+        SchemaParser(validate_docs=True).dataclass2json(NoDescription)
+    assert SchemaParser().dataclass2json(NoDescription)
+    with pytest.raises(InvalidSpecException):
+        SchemaParser(validate_docs=True).dataclass2json(NoDescription)
+
+
+def test_discriminator(parser: SchemaParser):
+    schema = parser.dataclass2json(Events)
+    event = schema["properties"]["event"]
+    assert event["discriminator"] == {
+        "propertyName": "type",
+        "mapping": {
+            "click": "#/components/schemas/ClickEvent",
+            "view": "#/components/schemas/ViewEvent",
+        },
+    }
+    assert len(event["oneOf"]) == 2
+    events = schema["properties"]["events"]
+    assert events["items"]["discriminator"] == event["discriminator"]
+    assert {"ClickEvent", "ViewEvent"} <= set(parser.schemas_to_parse)
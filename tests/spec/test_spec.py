@@ -3,7 +3,9 @@ import pytest
 from openapi.exc import InvalidSpecException
 from openapi.rest import rest
 from openapi.spec import OpenApi, OpenApiSpec
-from openapi.testing import json_body
+from openapi.spec import spec as spec_module
+from openapi.spec.spec import SPEC_CACHE
+from openapi.testing import app_cli, json_body
 from tests.example import endpoints, endpoints_additional
 from tests.utils import FakeRequest
 
@@ -110,3 +112,129 @@ async def test_redoc(cli):
     docs = await response.text()
     assert response.status == 200
     assert docs
+
+
+async def test_spec_etag(cli):
+    response = await cli.get("/spec")
+    spec = await json_body(response)
+    etag = response.headers["etag"]
+    assert etag
+    response = await cli.get("/spec")
+    assert await json_body(response) == spec
+    assert response.headers["etag"] == etag
+    response = await cli.get("/spec", headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert response.headers["etag"] == etag
+    response = await cli.get("/spec", headers={"If-None-Match": '"bla"'})
+    assert response.status == 200
+
+
+async def test_spec_etag_encoding(cli):
+    response = await cli.get("/spec", headers={"Accept-Encoding": "identity"})
+    await json_body(response)
+    etag = response.headers["etag"]
+    response = await cli.get("/spec", headers={"Accept-Encoding": "gzip"})
+    await json_body(response)
+    gzip_etag = response.headers["etag"]
+    assert gzip_etag == f'{etag[:-1]}-gzip"'
+    response = await cli.get(
+        "/spec", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag}
+    )
+    assert response.status == 304
+    assert response.headers["etag"] == etag
+
+
+async def test_spec_cache_key(cli):
+    await json_body(await cli.get("/spec"))
+    response = await cli.get(
+        "/spec",
+        headers={"X-Forwarded-Proto": "https", "X-Forwarded-Host": "fake.com"},
+    )
+    spec = await json_body(response)
+    assert spec["servers"] == [{"url": "https://fake.com", "description": "Api server"}]
+    cache = cli.app[SPEC_CACHE]
+    assert len(cache) == 2
+    spec_doc = cache["https://fake.com"]
+    encoding = response.headers.get("content-encoding")
+    assert spec_doc.encoding_etag(encoding) == response.headers["etag"].strip('"')
+
+
+async def test_spec_cache_size(cli, mocker):
+    mocker.patch.object(spec_module, "SPEC_CACHE_SIZE", 2)
+    for host in ("a.com", "b.com", "a.com", "c.com"):
+        headers = {"X-Forwarded-Proto": "https", "X-Forwarded-Host": host}
+        await json_body(await cli.get("/spec", headers=headers))
+    assert list(cli.app[SPEC_CACHE]) == ["https://a.com", "https://c.com"]
+
+
+async def test_spec_compressed(cli):
+    response = await cli.get("/spec", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    spec = await json_body(response)
+    response = await cli.get("/spec", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert await json_body(response) == spec
+    response = await cli.get("/spec", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_spec_precompute():
+    cli = rest(
+        openapi=dict(title="Precomputed"),
+        base_path="/v1",
+        setup_app=lambda app: app.router.add_routes(endpoints.routes),
+    )
+    cli.spec.precompute = True
+    app = cli.get_serve_app()
+    async with app_cli(app) as client:
+        sub_app = cli.web(server=True)
+        spec_doc = sub_app[SPEC_CACHE][None]
+        response = await client.get("/v1/spec", headers={"Accept-Encoding": "identity"})
+        spec = await json_body(response)
+        assert spec["servers"] == [{"url": "/v1", "description": "Api server"}]
+        assert "/tasks" in spec["paths"]
+        assert response.headers["etag"] == f'"{spec_doc.etag}"'
+        assert list(sub_app[SPEC_CACHE]) == [None]
+
+
+async def test_spec_precompute_no_cache():
+    cli = rest(
+        openapi=dict(title="Precomputed"),
+        base_path="/v1",
+        setup_app=lambda app: app.router.add_routes(endpoints.routes),
+    )
+    cli.spec.precompute = True
+    cli.spec.cache = False
+    app = cli.get_serve_app()
+    async with app_cli(app) as client:
+        sub_app = cli.web(server=True)
+        spec_doc = sub_app[SPEC_CACHE][None]
+        response = await client.get("/v1/spec", headers={"Accept-Encoding": "identity"})
+        spec = await json_body(response)
+        assert spec["servers"] == [{"url": "/v1", "description": "Api server"}]
+        assert response.headers["etag"] == f'"{spec_doc.etag}"'
+
+
+async def test_spec_precompute_invalid():
+    def setup_app(app):
+        app.router.add_routes(endpoints_additional.invalid_path_routes)
+
+    cli = rest(openapi={}, validate_docs=True, setup_app=setup_app)
+    cli.spec.precompute = True
+    with pytest.raises(InvalidSpecException):
+        async with app_cli(cli.get_serve_app()):
+            pass
+
+
+async def test_spec_file(tmp_path):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text("openapi: 3.0.2\ninfo:\n  title: From file\npaths: {}\n")
+    cli = rest(openapi=dict(title="Not used"))
+    cli.spec.spec_file = str(spec_file)
+    async with app_cli(cli.get_serve_app()) as client:
+        response = await client.get("/spec")
+        spec = await json_body(response)
+        assert spec["info"]["title"] == "From file"
+        assert spec["paths"] == {}
+        assert response.headers["etag"]
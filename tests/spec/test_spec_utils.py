@@ -56,3 +56,16 @@ def test_load_yaml_from_docstring_invalid():
     """
     yaml_data = load_yaml_from_docstring(docstring)
     assert yaml_data is None
+
+
+def test_load_yaml_from_docstring_copy():
+    docstring = """Summary
+
+    ---
+    tags:
+        - Task
+    """
+    doc = load_yaml_from_docstring(docstring)
+    assert doc == {"tags": ["Task"]}
+    doc.pop("tags")
+    assert load_yaml_from_docstring(docstring) == {"tags": ["Task"]}